@@ -169,8 +169,14 @@ def _summarize_results(results: List[ResultadoEnvio]) -> None:
     )
 
 
-def load_contacts(path: str | Path, sheet: str | None) -> pd.DataFrame:
-    """Carrega a planilha de contatos respeitando a aba informada."""
+def load_contacts(
+    path: str | Path, sheet: str | None, *, nrows: int | None = None
+) -> pd.DataFrame:
+    """Carrega a planilha de contatos respeitando a aba informada.
+
+    ``nrows`` limita a leitura às primeiras linhas de dados (o cabeçalho é
+    sempre lido), útil quando só uma amostra é necessária.
+    """
 
     file_path = Path(path)
     if not file_path.exists():
@@ -179,14 +185,14 @@ def load_contacts(path: str | Path, sheet: str | None) -> pd.DataFrame:
     suffix = file_path.suffix.lower()
     try:
         if suffix == ".csv":
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, nrows=nrows)
         elif suffix in {".xls", ".xlsx"}:
             sheet_name: str | int | None
             if sheet:
                 sheet_name = sheet
             else:
                 sheet_name = 0
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
         else:
             raise ValueError(
                 "Formato de arquivo não suportado. Utilize CSV ou XLSX."
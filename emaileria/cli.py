@@ -248,8 +248,10 @@ def _build_preview_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _load_contacts(path: Path, sheet: str | None):
-    return load_contacts(path, sheet)
+def _load_contacts(path: Path, sheet: str | None, nrows: int | None = None):
+    if nrows is None:
+        return load_contacts(path, sheet)
+    return load_contacts(path, sheet, nrows=nrows)
 
 
 def _render_preview(
@@ -427,7 +429,13 @@ def main(argv: list[str] | None = None) -> None:
             preview_args.body_template, preview_args.body_template_file
         )
 
-        contacts_df = _load_contacts(preview_args.excel, preview_args.sheet)
+        # The gallery renders at most ``--limit`` rows, so read no more than that;
+        # a non-positive limit is still rejected by _render_preview.
+        contacts_df = _load_contacts(
+            preview_args.excel,
+            preview_args.sheet,
+            nrows=preview_args.limit if preview_args.limit > 0 else None,
+        )
         entries = _render_preview(
             contacts=contacts_df.to_dict(orient="records"),
             subject_template=subject_template,
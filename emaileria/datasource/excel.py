@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import csv
+import mmap
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Collection, Iterable, Iterator, Mapping, Sequence
 
 import pandas as pd
+from openpyxl import load_workbook
 
 REQUIRED_COLUMNS = {"email", "tratamento", "nome"}
+_OPENPYXL_SUFFIXES = {".xlsx", ".xlsm"}
+_CSV_BUFFER_SIZE = 1 << 20
 
 
 def _clean_column_name(column: str) -> str:
@@ -28,27 +34,285 @@ def _normalize_required_columns(columns: Iterable[str]) -> dict[str, str]:
     return {lower_map[column]: column for column in REQUIRED_COLUMNS}
 
 
-def load_contacts(path: str | Path, sheet: str | None = None) -> pd.DataFrame:
-    """Load contacts from an XLSX or CSV file, normalizing required headers."""
+def _normalize_header_row(header: Sequence[object]) -> list[str]:
+    cleaned = [
+        _clean_column_name(column) if column is not None else f"Unnamed: {position}"
+        for position, column in enumerate(header)
+    ]
+    rename_map = _normalize_required_columns(cleaned)
+    return [rename_map.get(column, column) for column in cleaned]
+
+
+def _cell_to_str(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _selected_positions(
+    headers: Sequence[str], columns: Collection[str] | None
+) -> list[int] | None:
+    """Return the header positions to keep, or ``None`` to keep them all."""
+    if columns is None:
+        return None
+    wanted = {str(column).strip().lower() for column in columns} | REQUIRED_COLUMNS
+    return [
+        position
+        for position, header in enumerate(headers)
+        if header.lower() in wanted
+    ]
+
+
+def _iter_csv_contacts(
+    file_path: Path, columns: Collection[str] | None
+) -> Iterator[dict[str, str]]:
+    with file_path.open(
+        "r", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE
+    ) as csv_file:
+        reader = csv.reader(csv_file)
+        headers = _normalize_header_row(next((row for row in reader if row), []))
+        positions = _selected_positions(headers, columns)
+        if positions is None:
+            positions = list(range(len(headers)))
+        selected = [(headers[position], position) for position in positions]
+        width = len(headers)
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            yield {column: row[position] for column, position in selected}
+
+
+class _MappedFile:
+    """File-like view over an ``mmap`` that ``zipfile`` accepts.
+
+    ``mmap.mmap`` only gained ``seekable()`` in Python 3.13.
+    """
+
+    def __init__(self, mapped: mmap.mmap) -> None:
+        self._mapped = mapped
+
+    def seekable(self) -> bool:
+        return True
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._mapped, name)
+
+
+@contextmanager
+def _map_readonly(file_obj: BinaryIO) -> Iterator[_MappedFile | BinaryIO]:
+    """Expose ``file_obj`` through a read-only memory map when possible."""
+    try:
+        mapped = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # empty files or filesystems without mmap
+        yield file_obj
+        return
+    with mapped:
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        yield _MappedFile(mapped)
+
+
+def _iter_xlsx_contacts(
+    file_path: Path, sheet: str | None, columns: Collection[str] | None
+) -> Iterator[dict[str, str]]:
+    with file_path.open("rb") as raw_file, _map_readonly(raw_file) as source:
+        yield from _iter_workbook_contacts(source, sheet, columns)
+
+
+def _iter_workbook_contacts(
+    source: _MappedFile | BinaryIO,
+    sheet: str | None,
+    columns: Collection[str] | None,
+) -> Iterator[dict[str, str]]:
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        if sheet and sheet.strip():
+            try:
+                worksheet = workbook[sheet.strip()]
+            except KeyError as exc:
+                raise ValueError(f"Aba não encontrada: {sheet.strip()}") from exc
+        else:
+            if not workbook.worksheets:
+                raise ValueError("Nenhuma aba encontrada no arquivo Excel.")
+            worksheet = workbook.worksheets[0]
+
+        rows = worksheet.iter_rows(values_only=True)
+        headers = _normalize_header_row(next(rows, None) or ())
+        positions = _selected_positions(headers, columns)
+        if positions is None:
+            positions = list(range(len(headers)))
+        width = len(headers)
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if len(row) < width:
+                row = (*row, *(None,) * (width - len(row)))
+            yield {headers[position]: _cell_to_str(row[position]) for position in positions}
+    finally:
+        workbook.close()
+
+
+def _iter_parquet_contacts(
+    file_path: Path, columns: Collection[str] | None
+) -> Iterator[dict[str, str]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "Leitura de arquivos Parquet requer o pacote 'pyarrow'."
+        ) from exc
+
+    parquet_file = pq.ParquetFile(file_path)
+    source_columns = list(parquet_file.schema_arrow.names)
+    headers = _normalize_header_row(source_columns)
+    positions = _selected_positions(headers, columns)
+    if positions is None:
+        positions = list(range(len(headers)))
+    selected_source = [source_columns[position] for position in positions]
+    selected_headers = [headers[position] for position in positions]
+
+    for batch in parquet_file.iter_batches(columns=selected_source):
+        for row in batch.to_pylist():
+            yield {
+                header: _cell_to_str(row[source])
+                for header, source in zip(selected_headers, selected_source)
+            }
+
+
+def _calamine_sheet_names(file_path: Path) -> list[str] | None:
+    """Read sheet names with the optional ``python-calamine`` package, if present."""
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:  # pragma: no cover - dependência opcional
+        return None
+
+    workbook = CalamineWorkbook.from_path(str(file_path))
+    try:
+        return list(workbook.sheet_names)
+    finally:
+        close = getattr(workbook, "close", None)
+        if close is not None:
+            close()
+
+
+def list_sheet_names(path: str | Path) -> list[str]:
+    """Return the worksheet names of an Excel file without loading any cells.
+
+    The Rust-backed ``python-calamine`` reader is used when installed; unlike
+    openpyxl it does not parse the shared-strings table just to list sheets.
+    """
+    file_path = Path(path)
+    sheet_names = _calamine_sheet_names(file_path)
+    if sheet_names is not None:
+        return sheet_names
+    if file_path.suffix.lower() in _OPENPYXL_SUFFIXES:
+        workbook = load_workbook(
+            file_path, read_only=True, data_only=True, keep_links=False
+        )
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    with pd.ExcelFile(file_path) as workbook:
+        return list(workbook.sheet_names)
+
+
+def load_contacts(
+    path: str | Path, sheet: str | None = None, *, nrows: int | None = None
+) -> pd.DataFrame:
+    """Load contacts from an XLSX or CSV file, normalizing required headers.
+
+    ``nrows`` stops reading after that many data rows; the header is always read.
+    """
     file_path = Path(path)
 
     if not file_path.exists():
         raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
+    read_options: dict[str, object] = {"dtype": str}
+    if nrows is not None:
+        read_options["nrows"] = nrows
+
     if file_path.suffix.lower() == ".csv":
-        data = pd.read_csv(file_path, dtype=str).fillna("")
+        data = pd.read_csv(file_path, **read_options).fillna("")
     else:
         if sheet and sheet.strip():
-            data = pd.read_excel(file_path, sheet_name=sheet.strip(), dtype=str).fillna("")
+            data = pd.read_excel(
+                file_path, sheet_name=sheet.strip(), **read_options
+            ).fillna("")
         else:
             with pd.ExcelFile(file_path) as workbook:
                 if not workbook.sheet_names:
                     raise ValueError("Nenhuma aba encontrada no arquivo Excel.")
                 first_sheet = workbook.sheet_names[0]
-                data = pd.read_excel(workbook, sheet_name=first_sheet, dtype=str).fillna("")
+                data = pd.read_excel(
+                    workbook, sheet_name=first_sheet, **read_options
+                ).fillna("")
 
     cleaned_columns = {column: _clean_column_name(column) for column in data.columns}
     data = data.rename(columns=cleaned_columns)
 
     rename_map = _normalize_required_columns(data.columns)
     return data.rename(columns=rename_map)
+
+
+def _with_defaults(
+    rows: Iterator[dict[str, str]], defaults: Mapping[str, str]
+) -> Iterator[dict[str, str]]:
+    # Every row of a file shares the same columns, so the first row tells us
+    # which defaults are needed for all of them.
+    missing: dict[str, str] | None = None
+    for row in rows:
+        if missing is None:
+            missing = {key: value for key, value in defaults.items() if key not in row}
+        if missing:
+            row.update(missing)
+        yield row
+
+
+def iter_contacts(
+    path: str | Path,
+    sheet: str | None = None,
+    *,
+    columns: Collection[str] | None = None,
+    defaults: Mapping[str, str] | None = None,
+) -> Iterator[dict[str, str]]:
+    """Yield contacts one row at a time without building a DataFrame.
+
+    XLSX files are streamed with openpyxl in read-only mode, CSV files with the
+    ``csv`` module and Parquet files in record batches with the optional
+    ``pyarrow`` dependency; other formats fall back to :func:`load_contacts`. Headers
+    are normalized exactly as in :func:`load_contacts` and every value is a
+    string, with empty cells mapped to ``""``.
+
+    When ``columns`` is given only those columns (matched case-insensitively)
+    plus the required ones are materialized for each row. ``defaults`` fills in
+    columns that are absent from the file; the missing set is computed once.
+    """
+    file_path = Path(path)
+
+    if not file_path.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+
+    suffix = file_path.suffix.lower()
+    rows: Iterator[dict[str, str]]
+    if suffix == ".csv":
+        rows = _iter_csv_contacts(file_path, columns)
+    elif suffix in _OPENPYXL_SUFFIXES:
+        rows = _iter_xlsx_contacts(file_path, sheet, columns)
+    elif suffix == ".parquet":
+        rows = _iter_parquet_contacts(file_path, columns)
+    else:
+        data = load_contacts(file_path, sheet)
+        positions = _selected_positions(list(data.columns), columns)
+        if positions is not None:
+            data = data.iloc[:, positions]
+        rows = iter(data.to_dict(orient="records"))
+
+    if defaults:
+        return _with_defaults(rows, defaults)
+    return rows
@@ -11,11 +11,20 @@ def _resolve_url(index_path: str | Path) -> str:
     return path.as_uri()
 
 
+_SCRIPT_RE = re.compile(r"(?is)<script.*?>.*?</script>")
+_HANDLER_DQ_RE = re.compile(r" on\w+\s*=\s*\".*?\"")
+_HANDLER_SQ_RE = re.compile(r" on\w+\s*=\s*\'.*?\'")
+
+
 def _strip_scripts(html_text: str) -> str:
     """Remove scripts e event handlers potencialmente inseguros."""
-    html_text = re.sub(r"(?is)<script.*?>.*?</script>", "", html_text)
-    html_text = re.sub(r" on\w+\s*=\s*\".*?\"", "", html_text)
-    html_text = re.sub(r" on\w+\s*=\s*\'.*?\'", "", html_text)
+    # Scripts are rare in e-mail bodies; skip the rewrites when there is nothing
+    # to strip. The script regex is case-insensitive, so no lowered copy is needed.
+    if _SCRIPT_RE.search(html_text):
+        html_text = _SCRIPT_RE.sub("", html_text)
+    if " on" in html_text:
+        html_text = _HANDLER_DQ_RE.sub("", html_text)
+        html_text = _HANDLER_SQ_RE.sub("", html_text)
     return html_text
 
 
@@ -9,7 +9,7 @@ import threading
 import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
 import pandas as pd
 
@@ -170,6 +170,8 @@ def _send_with_retries(
 def _prepare_context(row: Dict[str, object]) -> Dict[str, str]:
     context: Dict[str, str] = {}
     for key, value in row.items():
+        if key == "__row_position__":
+            continue
         normalized_value = "" if pd.isna(value) else str(value)
         lowercase_key = key.lower()
         if lowercase_key in REQUIRED_KEYS:
@@ -208,7 +210,7 @@ def _create_message(
     return message
 
 
-def send_messages(
+def iter_messages(
     *,
     sender: str,
     contacts: Iterable[Dict[str, object]],
@@ -222,17 +224,50 @@ def send_messages(
     bcc: Sequence[str] | None = None,
     reply_to: str | None = None,
     cancel_event: threading.Event | None = None,
-) -> List[ResultadoEnvio]:
-    """Render and optionally send messages for every contact."""
+) -> Iterator[ResultadoEnvio]:
+    """Lazily render and optionally send a message per contact.
+
+    Contacts are consumed one at a time and each result is yielded as soon as
+    it is ready, so neither the input nor the output has to fit in memory.
+    """
     if not dry_run and provider is None:
         raise ValueError("provider is required when dry_run is False")
 
+    return _iter_results(
+        sender=sender,
+        contacts=contacts,
+        subject_template=subject_template,
+        body_template=body_template,
+        provider=provider,
+        dry_run=dry_run,
+        allow_missing_fields=allow_missing_fields,
+        interval_seconds=interval_seconds,
+        cc=cc,
+        bcc=bcc,
+        reply_to=reply_to,
+        cancel_event=cancel_event,
+    )
+
+
+def _iter_results(
+    *,
+    sender: str,
+    contacts: Iterable[Dict[str, object]],
+    subject_template: str,
+    body_template: str,
+    provider: EmailProvider | None,
+    dry_run: bool,
+    allow_missing_fields: bool,
+    interval_seconds: float,
+    cc: Sequence[str] | None,
+    bcc: Sequence[str] | None,
+    reply_to: str | None,
+    cancel_event: threading.Event | None,
+) -> Iterator[ResultadoEnvio]:
     rate_limiter: Optional[_TokenBucket] = None
     if not dry_run and provider is not None:
         rate_limiter = _get_rate_limiter()
 
-    results: List[ResultadoEnvio] = []
-
     normalized_cc = [addr for addr in (cc or []) if addr]
     normalized_bcc = [addr for addr in (bcc or []) if addr]
 
@@ -240,15 +275,8 @@ def send_messages(
         if cancel_event is not None and cancel_event.is_set():
             logger.info("Envio interrompido pelo usuário após %s registros.", index - 1)
             break
-        row_position = index
-        if isinstance(row, dict):
-            if "__row_position__" in row:
-                row_position = row.get("__row_position__", index)
-                row_data = {k: v for k, v in row.items() if k != "__row_position__"}
-            else:
-                row_data = dict(row)
-        else:
-            row_data = dict(row)
+        row_data = row if isinstance(row, dict) else dict(row)
+        row_position = row_data.get("__row_position__", index)
 
         context = _prepare_context(row_data)
 
@@ -293,7 +321,6 @@ def send_messages(
             result = ResultadoEnvio(
                 destinatario=context["email"], sucesso=True, assunto=subject
             )
-            results.append(result)
         else:
             message = _create_message(
                 sender,
@@ -306,9 +333,49 @@ def send_messages(
             )
             result = _send_with_retries(provider, message, rate_limiter)
             result.assunto = subject
-            results.append(result)
 
-        if interval_seconds > 0 and not (cancel_event is not None and cancel_event.is_set()):
-            time.sleep(interval_seconds)
+        yield result
+
+        if interval_seconds > 0:
+            if cancel_event is None:
+                time.sleep(interval_seconds)
+            else:
+                # Returns as soon as cancellation is requested mid-interval.
+                cancel_event.wait(interval_seconds)
+
 
-    return results
+def send_messages(
+    *,
+    sender: str,
+    contacts: Iterable[Dict[str, object]],
+    subject_template: str,
+    body_template: str,
+    provider: EmailProvider | None = None,
+    dry_run: bool = False,
+    allow_missing_fields: bool = False,
+    interval_seconds: float = 0.0,
+    cc: Sequence[str] | None = None,
+    bcc: Sequence[str] | None = None,
+    reply_to: str | None = None,
+    cancel_event: threading.Event | None = None,
+) -> List[ResultadoEnvio]:
+    """Render and optionally send messages for every contact.
+
+    This is :func:`iter_messages` collected into a list.
+    """
+    return list(
+        iter_messages(
+            sender=sender,
+            contacts=contacts,
+            subject_template=subject_template,
+            body_template=body_template,
+            provider=provider,
+            dry_run=dry_run,
+            allow_missing_fields=allow_missing_fields,
+            interval_seconds=interval_seconds,
+            cc=cc,
+            bcc=bcc,
+            reply_to=reply_to,
+            cancel_event=cancel_event,
+        )
+    )
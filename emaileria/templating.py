@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import re
+from collections import ChainMap
 from datetime import date, datetime
+from functools import lru_cache
 from typing import Dict, Mapping, Tuple
 
 from typing import Callable
 
-from jinja2 import Environment, StrictUndefined, Undefined, UndefinedError
+from jinja2 import Environment, StrictUndefined, Template, Undefined, UndefinedError, meta
 
 _PLACEHOLDER_PATTERN = r"'(.+?)' is undefined"
+_PLACEHOLDER_RE = re.compile(r"{{\s*([a-zA-Z0-9_]+)\s*}}")
 
 
 class TemplateRenderingError(RuntimeError):
@@ -31,6 +34,13 @@ class SoftUndefined(Undefined):
         return ""
 
 
+class _SoftContext(ChainMap):
+    """Render context that resolves unknown names to ``""`` like SoftUndefined."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
 _STRICT_ENV = Environment(
     autoescape=False, undefined=StrictUndefined, keep_trailing_newline=True
 )
@@ -40,7 +50,25 @@ _SOFT_ENV = Environment(autoescape=False, undefined=SoftUndefined, keep_trailing
 def extract_placeholders(text: str) -> set[str]:
     """Extract placeholder names from template-like text."""
 
-    return set(re.findall(r"{{\s*([a-zA-Z0-9_]+)\s*}}", text or ""))
+    return set(_template_placeholders(text or ""))
+
+
+def template_variables(*templates: str) -> set[str]:
+    """Return every top-level variable referenced by the given templates.
+
+    Unlike :func:`extract_placeholders` this walks the Jinja AST, so expressions
+    such as ``{{ nome | default('') }}`` are also reported.
+    """
+
+    names: set[str] = set()
+    for template in templates:
+        names |= meta.find_undeclared_variables(_SOFT_ENV.parse(template or ""))
+    return names
+
+
+@lru_cache(maxsize=64)
+def _template_placeholders(text: str) -> frozenset[str]:
+    return frozenset(_PLACEHOLDER_RE.findall(text or ""))
 
 
 def _datefmt(value: object, fmt: str = "%Y-%m-%d") -> str:
@@ -73,6 +101,48 @@ def _extract_placeholder_name(error: UndefinedError) -> str:
     return str(error)
 
 
+@lru_cache(maxsize=128)
+def _compile(environment: Environment, template: str) -> Template:
+    """Compile ``template`` once per environment and reuse it across renders."""
+    return environment.from_string(template)
+
+
+_JINJA_MARKERS = ("{{", "{%", "{#")
+# Names Jinja resolves to literals rather than looking up in the context.
+_JINJA_CONSTANTS = frozenset({"true", "false", "none", "True", "False", "None"})
+
+
+@lru_cache(maxsize=128)
+def _format_string(template: str) -> str | None:
+    """Translate a template made only of ``{{ name }}`` placeholders to ``str.format``.
+
+    Returns ``None`` when the template uses any other Jinja syntax (filters,
+    statements, comments), names a Jinja constant or global such as
+    ``{{ true }}`` or ``{{ range }}``, puts a literal ``{`` right before a
+    placeholder, or contains ``\\r`` (Jinja normalises newlines), and therefore
+    has to go through Jinja.
+    """
+    if "\r" in template:
+        return None
+    parts = _PLACEHOLDER_RE.split(template)
+    literals, names = parts[0::2], parts[1::2]
+    if any(marker in literal for literal in literals for marker in _JINJA_MARKERS):
+        return None
+    # "{{{ nome }}" is a syntax error for Jinja; let it raise there.
+    if any(literal.endswith("{") for literal in literals[:-1]):
+        return None
+    if any(
+        name[0].isdigit() or name in _JINJA_CONSTANTS or name in _STRICT_ENV.globals
+        for name in names
+    ):
+        return None
+    pieces = [literals[0].replace("{", "{{").replace("}", "}}")]
+    for name, literal in zip(names, literals[1:]):
+        pieces.append("{" + name + "}")
+        pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+    return "".join(pieces)
+
+
 def _render_template(
     template: str,
     context: Mapping[str, object],
@@ -80,8 +150,15 @@ def _render_template(
     *,
     environment: Environment,
 ) -> str:
+    format_string = _format_string(template)
+    if format_string is not None:
+        try:
+            return format_string.format_map(context)
+        except KeyError as exc:
+            placeholder = str(exc.args[0])
+            raise TemplateRenderingError(template_type, placeholder, exc) from exc
     try:
-        return environment.from_string(template).render(**context)
+        return _compile(environment, template).render(context)
     except UndefinedError as exc:  # pragma: no cover - defensive parsing
         placeholder = _extract_placeholder_name(exc)
         raise TemplateRenderingError(template_type, placeholder, exc) from exc
@@ -96,15 +173,20 @@ def render(
     on_missing: Callable[[str], None] | None = None,
 ) -> Tuple[str, str]:
     """Render subject and body templates with the provided context."""
-    merged_context: Dict[str, object] = {**_global_context(), **dict(context)}
+    # Layer the row over the shared globals instead of copying both into a new
+    # dict; Jinja makes its own single copy when it builds the render context.
+    context_type = _SoftContext if allow_missing else ChainMap
+    merged_context: Mapping[str, object] = context_type(
+        context, _global_context()  # type: ignore[arg-type]
+    )
     environment = _SOFT_ENV if allow_missing else _STRICT_ENV
 
     missing_placeholders: set[str] = set()
     if allow_missing:
         normalized_keys = {str(key).strip().lower() for key in merged_context}
-        used_placeholders = extract_placeholders(subject_template) | extract_placeholders(
-            body_template
-        )
+        used_placeholders = _template_placeholders(
+            subject_template
+        ) | _template_placeholders(body_template)
         missing_placeholders = {
             placeholder
             for placeholder in used_placeholders
@@ -228,16 +228,19 @@ def validate_schema(df: pd.DataFrame) -> None:
         )
 
 
+def _isna(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
 def build_context(row: Dict[str, Any], index: int) -> Dict[str, Any]:
     context: Dict[str, Any] = {}
-    lower_aliases: Dict[str, Any] = {}
     for key, value in row.items():
         key_str = str(key).strip()
-        normalized_value = "" if pd.isna(value) else value
+        normalized_value = "" if _isna(value) else value
         context[key_str] = normalized_value
-        lower_aliases[key_str.lower()] = normalized_value
-    for alias, value in lower_aliases.items():
-        context.setdefault(alias, value)
+        alias = key_str.lower()
+        if alias != key_str and alias not in context:
+            context[alias] = normalized_value
     context["linha"] = index
     context["index"] = index
     return context
@@ -367,6 +370,18 @@ def send_all(
     envelope_from = parseaddr(from_address)[1] or user
     success_count = 0
     failure_count = 0
+    last_timestamp: List[Any] = [0, ""]
+
+    def _timestamp_now() -> str:
+        # Log granularity is one second: reuse the formatted value within it.
+        current = int(time.time())
+        if current != last_timestamp[0]:
+            last_timestamp[0] = current
+            last_timestamp[1] = datetime.fromtimestamp(current).isoformat(
+                timespec="seconds"
+            )
+        return last_timestamp[1]
+
     with open(log_path, "a", newline="", encoding="utf-8") as log_file:
         writer = csv.writer(log_file)
         if not log_exists:
@@ -442,7 +457,7 @@ def send_all(
                             break
                         else:
                             sent = True
-                    timestamp = datetime.now().isoformat(timespec="seconds")
+                    timestamp = _timestamp_now()
                     if sent:
                         print(f"[{position}/{total}] {record['email']} — OK")
                         writer.writerow([timestamp, record["email"], subject, "sucesso", attempts, ""])
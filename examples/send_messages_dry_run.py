@@ -2,47 +2,133 @@
 
 from __future__ import annotations
 
+import os
 import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
-ROOT_DIR = Path(__file__).resolve().parents[1]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
+ROOT_DIR = str(Path(__file__).resolve().parents[1])
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
-from emaileria.datasource.excel import load_contacts as load_contacts_dataframe
-from emaileria.sender import send_messages
+from emaileria.datasource.excel import iter_contacts
+from emaileria.sender import iter_messages
+from emaileria.templating import template_variables
 
+_CHUNK_SIZE = 512
+# Chunks rendered or queued at once; keeps memory flat for large contact files.
+_MAX_IN_FLIGHT = 2 * (os.cpu_count() or 1)
 
-def _load_contacts(excel_path: Path) -> list[dict[str, str]]:
-    """Load contacts from an Excel file into a list of dictionaries."""
 
-    dataframe = load_contacts_dataframe(excel_path)
-    contacts = dataframe.to_dict(orient="records")
-    for contact in contacts:
-        contact.setdefault("data_envio", "")
-    return contacts
+def _iter_contacts(
+    contacts_path: Path, columns: set[str] | None = None
+) -> Iterator[dict[str, str]]:
+    """Yield contacts from a spreadsheet one dictionary at a time."""
 
+    yield from iter_contacts(
+        contacts_path, columns=columns, defaults={"data_envio": ""}
+    )
 
-def main() -> None:
-    examples_dir = Path(__file__).resolve().parent
-    contacts_path = examples_dir / "leads_exemplo.xlsx"
-    subject_template_path = examples_dir / "assunto_exemplo.txt"
-    body_template_path = examples_dir / "corpo_exemplo.html"
 
-    contacts = _load_contacts(contacts_path)
-    subject_template = subject_template_path.read_text(encoding="utf-8")
-    body_template = body_template_path.read_text(encoding="utf-8")
+def _iter_chunks(
+    contacts: Iterable[dict[str, str]], size: int
+) -> Iterator[list[dict[str, str]]]:
+    iterator = iter(contacts)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
-    results = send_messages(
+
+def _render_chunk(
+    subject_template: str,
+    body_template: str,
+    encoding: str,
+    contacts: list[dict[str, str]],
+) -> bytes:
+    """Render a batch of contacts and return the encoded report lines."""
+
+    results = iter_messages(
         sender="contato@example.com",
         contacts=contacts,
         subject_template=subject_template,
         body_template=body_template,
         dry_run=True,
     )
-
+    report = bytearray()
+    extend = report.extend
     for result in results:
-        print(f"{result.destinatario}: {result.assunto}")
+        extend(f"{result.destinatario}: {result.assunto}\n".encode(encoding, "replace"))
+    return bytes(report)
+
+
+def _iter_reports(
+    executor: Executor,
+    render_chunk: Callable[[list[dict[str, str]]], bytes],
+    chunks: Iterable[list[dict[str, str]]],
+    max_in_flight: int,
+) -> Iterator[bytes]:
+    """Yield rendered reports in input order with at most ``max_in_flight`` pending.
+
+    ``Executor.map`` submits every chunk up front, which would pull the whole
+    contact file into memory before the first report is written.
+    """
+    iterator = iter(chunks)
+    pending: deque[Future[bytes]] = deque(
+        executor.submit(render_chunk, chunk)
+        for chunk in islice(iterator, max_in_flight)
+    )
+    while pending:
+        future = pending.popleft()
+        next_chunk = next(iterator, None)
+        if next_chunk is not None:
+            pending.append(executor.submit(render_chunk, next_chunk))
+        yield future.result()
+
+
+def _write_report(report: bytes, encoding: str) -> None:
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(report.decode(encoding))
+    else:
+        sys.stdout.flush()
+        buffer.write(report)
+
+
+def main() -> None:
+    examples_dir = Path(__file__).resolve().parent
+    contacts_path = examples_dir / "leads_exemplo.parquet"
+    if not contacts_path.exists():
+        contacts_path = contacts_path.with_suffix(".xlsx")
+    subject_template_path = examples_dir / "assunto_exemplo.txt"
+    body_template_path = examples_dir / "corpo_exemplo.html"
+
+    subject_template = subject_template_path.read_text(encoding="utf-8")
+    body_template = body_template_path.read_text(encoding="utf-8")
+    needed = template_variables(subject_template, body_template) | {"data_envio"}
+    contacts = _iter_contacts(contacts_path, needed)
+
+    encoding = sys.stdout.encoding or "utf-8"
+    render_chunk = partial(_render_chunk, subject_template, body_template, encoding)
+    chunks = _iter_chunks(contacts, _CHUNK_SIZE)
+    first_chunk = next(chunks, [])
+    second_chunk = next(chunks, None)
+
+    if second_chunk is None:
+        # A single batch is not worth the cost of spawning worker processes.
+        _write_report(render_chunk(first_chunk), encoding)
+        return
+
+    with ProcessPoolExecutor() as executor:
+        for report in _iter_reports(
+            executor,
+            render_chunk,
+            chain([first_chunk, second_chunk], chunks),
+            _MAX_IN_FLIGHT,
+        ):
+            _write_report(report, encoding)
 
 
 if __name__ == "__main__":
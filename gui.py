@@ -7,12 +7,16 @@ import smtplib
 import socket
 import ssl
 import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Mapping, Optional
+from typing import Callable, Mapping, Optional
 
 import pandas as pd
 import PySimpleGUI as sg
+from jinja2 import Environment, Template, Undefined
 
 # ---- UX / DPI awareness ----
 import platform
@@ -58,39 +62,83 @@ except ImportError as exc:  # pragma: no cover - integração com UI
 else:
     IMPORT_ERROR = None
 
+from emaileria.datasource.excel import list_sheet_names
 from emaileria.templating import TemplateRenderingError, extract_placeholders, render
 from emaileria.preview import build_preview_page, open_preview_window
 
-REQUIRED_COLUMNS = {"email", "tratamento", "nome"}
+REQUIRED_COLUMNS = frozenset({"email", "tratamento", "nome"})
 SETTINGS_PATH = Path.home() / ".emaileria_gui.json"
 DEFAULT_SMTP_HOST = "smtp.gmail.com"
 DEFAULT_SMTP_PORT_SSL = 465
 DEFAULT_SMTP_PORT_STARTTLS = 587
+PREVIEW_SAMPLE_SIZE = 3
 PROCESSING_PATTERN = re.compile(
     r"Processando\s+(?P<processed>\d+)\s+contatos.*total[^0-9]*(?P<total>\d+)",
     re.IGNORECASE,
 )
 
-GLOBAL_PLACEHOLDERS = {"now", "hoje", "data_envio", "hora_envio"}
-EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+GLOBAL_PLACEHOLDERS = frozenset({"now", "hoje", "data_envio", "hora_envio"})
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+\Z")
+_EMAIL_SEPARATORS = str.maketrans(";\n", ",,")
 
 
 @dataclass
 class GuiState:
     last_preview_path: Path | None = None
     cancel_flag: bool = False
-    current_sheets: list[str] = field(default_factory=list)
+    current_sheets: frozenset[str] = frozenset()
     progress_state: dict[str, int] = field(
         default_factory=lambda: {"total": 0, "sent": 0}
     )
     validation_passed: bool = False
     worker_thread: Optional[threading.Thread] = None
+    settings: Optional[dict[str, object]] = None
+    window: Optional[sg.Window] = None
+    interval_display: Optional[float] = None
+    interactive_elements: tuple[sg.Element, ...] = ()
+    elements: dict[str, sg.Element] = field(default_factory=dict)
+    pending_excel_path: Optional[str] = None
+    sheet_request_path: Optional[str] = None
+    preferred_sheet: str = ""
+    excel_changed_at: float = 0.0
+    settings_dirty: bool = False
+    settings_flushed_at: float = 0.0
+    settings_version: int = 0
+    settings_written_version: int = 0
+    settings_payload: str = ""
+    settings_writer: Optional[threading.Thread] = None
 
 
 STATE = GuiState()
+# Only the UI thread consumes; deque.append/popleft are thread-safe on their
+# own, so the Queue lock and condition variable are unnecessary.
+log_queue: "deque[tuple[str, object]]" = deque()
+LOG_READY_EVENT = "-LOGREADY-"
+# Beyond this backlog DEBUG records are dropped; INFO and above always go
+# through because the progress counters are parsed from them.
+LOG_QUEUE_SOFT_LIMIT = 2000
+_log_wakeup_pending = threading.Event()
+_QUEUE_HANDLER_INSTALLED = False
+# Colours for the log's Tk text tags; configured once in _configure_log_tags.
+_LOG_TAG_COLORS = {"ERR": "red"}
+SETTINGS_FLUSH_INTERVAL = 2.0
+SHEET_REFRESH_DELAY = 0.4
+_SHEET_FILE_SUFFIXES = (".xlsx", ".xls")
+
+
+def _post_to_ui(tag: str, payload: object) -> None:
+    """Queue a message for the UI thread and wake its event loop once."""
+    log_queue.append((tag, payload))
+    if _log_wakeup_pending.is_set() or STATE.window is None:
+        return
+    _log_wakeup_pending.set()
+    try:
+        STATE.window.write_event_value(LOG_READY_EVENT, None)
+    except Exception:  # pylint: disable=broad-except
+        _log_wakeup_pending.clear()
 
 
-def _load_settings() -> dict[str, object]:
+def _read_settings_file() -> dict[str, object]:
     if not SETTINGS_PATH.exists():
         return {}
     try:
@@ -102,15 +150,78 @@ def _load_settings() -> dict[str, object]:
     return data
 
 
+def _load_settings() -> dict[str, object]:
+    """Return the in-memory settings, reading the file only on first use."""
+    if STATE.settings is None:
+        STATE.settings = _read_settings_file()
+    return STATE.settings
+
+
 def _write_settings(data: dict[str, object]) -> None:
+    """Update the in-memory settings; :func:`_flush_settings` persists them."""
+    STATE.settings = data
+    STATE.settings_dirty = True
+
+
+_settings_writes: "queue.Queue[tuple[int, str]]" = queue.Queue(maxsize=1)
+_settings_file_lock = threading.Lock()
+
+
+def _write_settings_file(version: int, payload: str) -> None:
+    with _settings_file_lock:
+        # The writer thread and the forced flush on exit can race; never let an
+        # older snapshot overwrite a newer one.
+        if version <= STATE.settings_written_version:
+            return
+        temporary_path = SETTINGS_PATH.with_suffix(".tmp")
+        try:
+            temporary_path.write_text(payload, encoding="utf-8")
+            os.replace(temporary_path, SETTINGS_PATH)
+        except OSError:
+            logging.getLogger(__name__).debug(
+                "Não foi possível salvar as preferências da GUI."
+            )
+            return
+        # Only a completed write counts, so a failed one is retried on exit.
+        STATE.settings_written_version = version
+
+
+def _settings_writer_loop() -> None:  # pragma: no cover - integração com UI
+    while True:
+        _write_settings_file(*_settings_writes.get())
+
+
+def _flush_settings(*, force: bool = False) -> None:
+    """Persist dirty settings off the UI thread; ``force`` writes synchronously."""
+    if STATE.settings_dirty and STATE.settings is not None:
+        now = time.monotonic()
+        if force or now - STATE.settings_flushed_at >= SETTINGS_FLUSH_INTERVAL:
+            STATE.settings_flushed_at = now
+            STATE.settings_dirty = False
+            STATE.settings_version += 1
+            STATE.settings_payload = json.dumps(
+                STATE.settings, ensure_ascii=False, indent=2
+            )
+            if not force:
+                _queue_settings_write(STATE.settings_version, STATE.settings_payload)
+    if force and STATE.settings_written_version < STATE.settings_version:
+        # Waits on the file lock for a write the daemon writer may have in
+        # flight, then rewrites the latest snapshot unless that write covered it.
+        _write_settings_file(STATE.settings_version, STATE.settings_payload)
+
+
+def _queue_settings_write(version: int, payload: str) -> None:
+    # Keep only the latest snapshot queued; a stale one is simply replaced.
     try:
-        SETTINGS_PATH.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-    except OSError:
-        logging.getLogger(__name__).debug(
-            "Não foi possível salvar as preferências da GUI."
+        _settings_writes.get_nowait()
+    except queue.Empty:
+        pass
+    _settings_writes.put_nowait((version, payload))
+    if STATE.settings_writer is None:
+        STATE.settings_writer = threading.Thread(
+            target=_settings_writer_loop, name="emaileria-settings", daemon=True
         )
+        STATE.settings_writer.start()
 
 
 def _save_settings(values: Mapping[str, object] | None) -> None:
@@ -135,36 +246,27 @@ def _save_settings(values: Mapping[str, object] | None) -> None:
         "subject_file": str(values.get("-SUBJECTFILE-", "") or ""),
     }
     settings = _load_settings()
+    if all(settings.get(key) == value for key, value in relevant.items()):
+        return
     settings.update(relevant)
     _write_settings(settings)
 
 
-def load_window_geometry() -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
-    settings = _load_settings()
-    size_raw = settings.get("win_size")
-    loc_raw = settings.get("win_loc")
-
-    size: tuple[int, int] | None
-    if (
-        isinstance(size_raw, (list, tuple))
-        and len(size_raw) == 2
-        and all(isinstance(item, (int, float)) for item in size_raw)
-    ):
-        size = (int(size_raw[0]), int(size_raw[1]))
-    else:
-        size = None
+def _as_int_pair(raw: object) -> tuple[int, int] | None:
+    if not isinstance(raw, (list, tuple)):
+        return None
+    try:
+        first, second = raw
+    except ValueError:
+        return None
+    if isinstance(first, (int, float)) and isinstance(second, (int, float)):
+        return int(first), int(second)
+    return None
 
-    location: tuple[int, int] | None
-    if (
-        isinstance(loc_raw, (list, tuple))
-        and len(loc_raw) == 2
-        and all(isinstance(item, (int, float)) for item in loc_raw)
-    ):
-        location = (int(loc_raw[0]), int(loc_raw[1]))
-    else:
-        location = None
 
-    return size, location
+def load_window_geometry() -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
+    settings = _load_settings()
+    return _as_int_pair(settings.get("win_size")), _as_int_pair(settings.get("win_loc"))
 
 
 def save_window_geometry(win: sg.Window) -> None:
@@ -180,12 +282,35 @@ def save_window_geometry(win: sg.Window) -> None:
     _write_settings(settings)
 
 
+_TEXT_FILE_CACHE: dict[str, tuple[int, int, str]] = {}
+_TEXT_FILE_CACHE_SIZE = 8
+
+
+def _read_text_cached(path: str) -> str:
+    """Read a UTF-8 file, reusing the decoded text while it is unchanged on disk."""
+    stat_result = os.stat(path)
+    cached = _TEXT_FILE_CACHE.get(path)
+    if (
+        cached is not None
+        and cached[0] == stat_result.st_mtime_ns
+        and cached[1] == stat_result.st_size
+    ):
+        return cached[2]
+    with open(path, "rb") as file:
+        text = file.read().decode("utf-8")
+    if cached is None and len(_TEXT_FILE_CACHE) >= _TEXT_FILE_CACHE_SIZE:
+        # Evict the oldest entry; dicts keep insertion order.
+        del _TEXT_FILE_CACHE[next(iter(_TEXT_FILE_CACHE))]
+    _TEXT_FILE_CACHE[path] = (stat_result.st_mtime_ns, stat_result.st_size, text)
+    return text
+
+
 def _read_html_template(path: str) -> str | None:
     if not path:
         sg.popup_error("Selecione o arquivo de template HTML.")
         return None
     try:
-        return Path(path).read_text(encoding="utf-8")
+        return _read_text_cached(path)
     except FileNotFoundError:
         sg.popup_error("Arquivo de template HTML não encontrado.")
     except OSError as exc:
@@ -194,17 +319,24 @@ def _read_html_template(path: str) -> str | None:
 
 
 def _normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
-    copy = df.copy()
-    copy.columns = [str(column).strip().lower() for column in copy.columns]
-    return copy
+    normalized = [str(column).strip().lower() for column in df.columns]
+    if normalized == list(df.columns):
+        return df
+    # ``set_axis`` relabels without copying the underlying data.
+    return df.set_axis(normalized, axis="columns")
 
 
 def _parse_email_list(raw_value: str) -> list[str]:
     if not raw_value:
         return []
-    normalized = raw_value.replace("\n", ",")
-    entries = [part.strip() for part in re.split(r"[;,]", normalized) if part.strip()]
-    invalid = [entry for entry in entries if not EMAIL_PATTERN.match(entry)]
+    entries: list[str] = []
+    invalid: list[str] = []
+    is_valid = EMAIL_PATTERN.match
+    for part in raw_value.translate(_EMAIL_SEPARATORS).split(","):
+        entry = part.strip()
+        if not entry:
+            continue
+        (entries if is_valid(entry) else invalid).append(entry)
     if invalid:
         raise ValueError("Endereços de e-mail inválidos: " + ", ".join(invalid))
     return entries
@@ -337,10 +469,10 @@ def _perform_smtp_login(
 
 
 def _test_smtp_credentials(window: sg.Window, values: Mapping[str, object]) -> None:
-    host_value = str(values.get("-SMTPHOST-", "") or "").strip() or DEFAULT_SMTP_HOST
+    host_value = _field_text(values, "-SMTPHOST-") or DEFAULT_SMTP_HOST
     use_starttls = bool(values.get("-SMTPSTARTTLS-", False))
     port_default = DEFAULT_SMTP_PORT_STARTTLS if use_starttls else DEFAULT_SMTP_PORT_SSL
-    port_raw = str(values.get("-SMTPPORT-", "") or "").strip()
+    port_raw = _field_text(values, "-SMTPPORT-")
     if port_raw:
         try:
             port_value = int(port_raw)
@@ -353,14 +485,14 @@ def _test_smtp_credentials(window: sg.Window, values: Mapping[str, object]) -> N
     else:
         port_value = port_default
 
-    username = str(values.get("-SMTPUSER-", "") or "").strip()
+    username = _field_text(values, "-SMTPUSER-")
     if not username:
-        username = str(values.get("-SENDER-", "") or "").strip()
+        username = _field_text(values, "-SENDER-")
     if not username:
         sg.popup_error("Informe o SMTP User para testar as credenciais.")
         return
 
-    password = str(values.get("-SMTPPASS-", "") or "").strip()
+    password = _field_text(values, "-SMTPPASS-")
     if not password:
         env_password = os.getenv("SMTP_PASSWORD", "").strip()
         password = env_password
@@ -436,10 +568,14 @@ def _test_smtp_credentials(window: sg.Window, values: Mapping[str, object]) -> N
         sg.popup_error(message_text, title="Teste de credenciais SMTP")
 
 def _update_interval_display(window: sg.Window, value: float) -> None:
-    window["-INTERVAL-LABEL-"].update(f"{value:.2f}s")
+    shown = round(value, 2)
+    if shown == STATE.interval_display:
+        return
+    STATE.interval_display = shown
+    window["-INTERVAL-LABEL-"].update(f"{shown:.2f}s")
 
 
-INTERACTIVE_KEYS = [
+INTERACTIVE_KEYS = (
     "-EXCEL-",
     "-EXCEL-BROWSE-",
     "-SHEET-",
@@ -466,31 +602,55 @@ INTERACTIVE_KEYS = [
     "-RUN-",
     "-OPEN-LAST-PREVIEW-",
     "-EXIT-",
-]
+)
 
-_VALIDATION_RESET_EVENTS = {
-    "-EXCEL-",
-    "-SHEET-",
-    "-SENDER-",
-    "-SMTPUSER-",
-    "-SMTPHOST-",
-    "-SMTPPORT-",
-    "-SMTPSTARTTLS-",
-    "-SUBJECT-",
-    "-SUBJECTFILE-",
-    "-HTML-",
-    "-DRYRUN-",
-    "-CC-",
-    "-BCC-",
-    "-REPLYTO-",
-}
+_VALIDATION_RESET_EVENTS = frozenset(
+    {
+        "-EXCEL-",
+        "-SHEET-",
+        "-SENDER-",
+        "-SMTPUSER-",
+        "-SMTPHOST-",
+        "-SMTPPORT-",
+        "-SMTPSTARTTLS-",
+        "-SUBJECT-",
+        "-SUBJECTFILE-",
+        "-HTML-",
+        "-DRYRUN-",
+        "-CC-",
+        "-BCC-",
+        "-REPLYTO-",
+    }
+)
+
+
+# Widgets touched on every log batch or state change; resolved once in main().
+_HOT_ELEMENT_KEYS = ("-LOG-", "-COUNTER-", "-PROGRESS-", "-RUN-")
+
+
+def _resolve_hot_elements(window: sg.Window) -> dict[str, sg.Element]:
+    return {
+        key: window.AllKeysDict[key]
+        for key in _HOT_ELEMENT_KEYS
+        if key in window.AllKeysDict
+    }
+
+
+def _element(window: sg.Window, key: str) -> sg.Element:
+    """Return a widget, preferring the reference cached at start-up."""
+    element = STATE.elements.get(key)
+    return element if element is not None else window[key]
+
+
+def _resolve_interactive_elements(window: sg.Window) -> tuple[sg.Element, ...]:
+    elements = (window.AllKeysDict.get(key) for key in INTERACTIVE_KEYS)
+    return tuple(element for element in elements if element is not None)
 
 
 def _set_controls_enabled(window: sg.Window, *, enabled: bool) -> None:
-    for key in INTERACTIVE_KEYS:
-        element = window.AllKeysDict.get(key)
-        if element is None:
-            continue
+    if not STATE.interactive_elements:
+        STATE.interactive_elements = _resolve_interactive_elements(window)
+    for element in STATE.interactive_elements:
         try:
             element.update(disabled=not enabled)
         except TypeError:
@@ -509,11 +669,11 @@ def _update_counter_display(window: sg.Window, *, unknown_total: bool = False) -
         total_display = "?"
     else:
         total_display = str(total)
-    window["-COUNTER-"].update(f"{sent}/{total_display}")
+    _element(window, "-COUNTER-").update(f"{sent}/{total_display}")
 
 
 def _update_run_button_state(window: sg.Window) -> None:
-    run_button = window.AllKeysDict.get("-RUN-")
+    run_button = STATE.elements.get("-RUN-") or window.AllKeysDict.get("-RUN-")
     if run_button is None:
         return
     should_enable = STATE.validation_passed
@@ -527,26 +687,22 @@ def _update_run_button_state(window: sg.Window) -> None:
 
 
 def _find_latest_preview() -> Path | None:
-    base = Path("previews")
-    if not base.exists():
-        return None
     try:
-        candidates = list(base.glob("*/index.html"))
+        with os.scandir("previews") as entries:
+            directories = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in entries
+                if entry.is_dir()
+            ]
     except OSError:
         return None
-    if not candidates:
-        return None
-    latest: Path | None = None
-    latest_mtime = float("-inf")
-    for candidate in candidates:
-        try:
-            mtime = candidate.stat().st_mtime
-        except OSError:
-            continue
-        if mtime > latest_mtime:
-            latest = candidate
-            latest_mtime = mtime
-    return latest
+    # Each preview run writes a fresh directory, so its mtime tracks the
+    # index.html inside it; scandir gets it without an extra stat on Windows.
+    for _, directory in sorted(directories, reverse=True):
+        candidate = Path(directory) / "index.html"
+        if candidate.is_file():
+            return candidate
+    return None
 
 
 def _set_validation_state(window: sg.Window, *, passed: bool) -> None:
@@ -555,7 +711,7 @@ def _set_validation_state(window: sg.Window, *, passed: bool) -> None:
 
 
 def _set_running_state(window: sg.Window, *, running: bool) -> None:
-    progress_bar = window["-PROGRESS-"]
+    progress_bar = _element(window, "-PROGRESS-")
     cancel_button = window["-CANCEL-"]
     if running:
         STATE.progress_state["total"] = 0
@@ -587,6 +743,17 @@ def _set_running_state(window: sg.Window, *, running: bool) -> None:
         _update_counter_display(window)
 
 
+_TEXT_SETTINGS = (
+    ("html", "-HTML-"),
+    ("sender", "-SENDER-"),
+    ("smtp_user", "-SMTPUSER-"),
+    ("cc", "-CC-"),
+    ("bcc", "-BCC-"),
+    ("reply_to", "-REPLYTO-"),
+    ("subject_file", "-SUBJECTFILE-"),
+)
+
+
 def _apply_saved_settings(window: sg.Window) -> None:
     settings = _load_settings()
     if not settings:
@@ -596,31 +763,19 @@ def _apply_saved_settings(window: sg.Window) -> None:
     if excel_path:
         window["-EXCEL-"].update(excel_path)
         if Path(excel_path).exists():
-            _update_sheet_combo(window, excel_path)
-
-    sheet_value = str(settings.get("sheet", "") or "")
-    if sheet_value and sheet_value in STATE.current_sheets:
-        window["-SHEET-"].update(value=sheet_value)
-
-    html_path = str(settings.get("html", "") or "")
-    if html_path:
-        window["-HTML-"].update(html_path)
-
-    sender_value = str(settings.get("sender", "") or "")
-    if sender_value:
-        window["-SENDER-"].update(sender_value)
+            _update_sheet_combo(
+                window, excel_path, preferred=str(settings.get("sheet", "") or "")
+            )
 
-    smtp_user = str(settings.get("smtp_user", "") or "")
-    if smtp_user:
-        window["-SMTPUSER-"].update(smtp_user)
+    for setting_key, element_key in _TEXT_SETTINGS:
+        setting_value = settings.get(setting_key)
+        if setting_value:
+            window[element_key].update(str(setting_value))
 
     smtp_host = str(settings.get("smtp_host", "") or "").strip()
-    if not smtp_host:
-        smtp_host = DEFAULT_SMTP_HOST
-    window["-SMTPHOST-"].update(smtp_host)
+    window["-SMTPHOST-"].update(smtp_host or DEFAULT_SMTP_HOST)
 
-    starttls_setting = settings.get("smtp_starttls")
-    use_starttls = bool(starttls_setting) if isinstance(starttls_setting, bool) else bool(starttls_setting)
+    use_starttls = bool(settings.get("smtp_starttls"))
     window["-SMTPSTARTTLS-"].update(use_starttls)
 
     smtp_port_setting = settings.get("smtp_port")
@@ -636,16 +791,6 @@ def _apply_saved_settings(window: sg.Window) -> None:
         )
     window["-SMTPPORT-"].update(smtp_port_value)
 
-    cc_value = str(settings.get("cc", "") or "")
-    bcc_value = str(settings.get("bcc", "") or "")
-    reply_value = str(settings.get("reply_to", "") or "")
-    if cc_value:
-        window["-CC-"].update(cc_value)
-    if bcc_value:
-        window["-BCC-"].update(bcc_value)
-    if reply_value:
-        window["-REPLYTO-"].update(reply_value)
-
     interval_value = settings.get("interval")
     if isinstance(interval_value, (int, float)):
         window["-INTERVAL-"].update(value=float(interval_value))
@@ -658,101 +803,211 @@ def _apply_saved_settings(window: sg.Window) -> None:
     if isinstance(dry_run_state, bool):
         window["-DRYRUN-"].update(dry_run_state)
 
-    subject_file = str(settings.get("subject_file", "") or "")
-    if subject_file:
-        window["-SUBJECTFILE-"].update(subject_file)
 
+def _handle_progress_from_log(window: sg.Window, text: str) -> None:
+    """Update the progress widgets from a batch of log lines.
 
-def _handle_progress_from_log(window: sg.Window, message: str) -> None:
-    match = PROCESSING_PATTERN.search(message)
-    if match:
+    Only the last "Processando" line matters (it resets the counters), and
+    every "Prepared email to" line after it counts as one processed contact,
+    so the whole batch is scanned once and the widgets are refreshed once.
+    """
+    reset = False
+    last_match = None
+    # Nearly every batch is only "Prepared email to" lines; skip the regex
+    # unless the (case-insensitive) keyword is present at all.
+    if "processando" in text.lower():
+        for last_match in PROCESSING_PATTERN.finditer(text):
+            pass
+    if last_match is not None:
         try:
-            STATE.progress_state["total"] = int(match.group("processed"))
+            STATE.progress_state["total"] = int(last_match.group("processed"))
         except (TypeError, ValueError):
             STATE.progress_state["total"] = 0
         STATE.progress_state["sent"] = 0
-        _update_counter_display(
-            window, unknown_total=STATE.progress_state["total"] == 0
-        )
-        if STATE.progress_state["total"] > 0:
-            try:
-                progress_bar = window["-PROGRESS-"]
-                progress_bar.update(
-                    current_count=0,
-                    max=STATE.progress_state["total"],
-                    visible=True,
-                )
-                progress_bar.Widget.stop()
-            except Exception:  # pylint: disable=broad-except
-                pass
+        text = text[last_match.end():]
+        reset = True
+
+    prepared = text.count("Prepared email to")
+    if not reset and not prepared:
         return
 
-    if "Prepared email to" in message:
-        STATE.progress_state["sent"] = STATE.progress_state.get("sent", 0) + 1
+    if prepared:
+        STATE.progress_state["sent"] = STATE.progress_state.get("sent", 0) + prepared
         if (
             STATE.progress_state.get("total")
             and STATE.progress_state["sent"]
             > STATE.progress_state.get("total", 0)
         ):
             STATE.progress_state["total"] = STATE.progress_state["sent"]
-        _update_counter_display(
-            window,
-            unknown_total=STATE.progress_state.get("total", 0) == 0,
-        )
-        if STATE.progress_state.get("total", 0) > 0:
-            try:
-                progress_bar = window["-PROGRESS-"]
+
+    _update_counter_display(
+        window, unknown_total=STATE.progress_state.get("total", 0) == 0
+    )
+    if STATE.progress_state.get("total", 0) > 0:
+        try:
+            progress_bar = _element(window, "-PROGRESS-")
+            if reset:
+                progress_bar.update(
+                    current_count=STATE.progress_state["sent"],
+                    max=STATE.progress_state["total"],
+                    visible=True,
+                )
+                progress_bar.Widget.stop()
+            else:
                 progress_bar.update(current_count=STATE.progress_state["sent"])
-            except Exception:  # pylint: disable=broad-except
-                pass
+        except Exception:  # pylint: disable=broad-except
+            pass
+
 
+@lru_cache(maxsize=8)
+def _sheet_names_cached(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Return a workbook's sheet names; the stat fields only key the cache."""
+    return tuple(list_sheet_names(path))
 
-def _update_sheet_combo(window: sg.Window, file_path: str) -> None:
+
+def _update_sheet_combo(
+    window: sg.Window, file_path: str, *, preferred: str = ""
+) -> None:
+    """Clear the sheet combo and list the workbook's sheets off the UI thread.
+
+    The result comes back as a ``SHEETS`` message handled by
+    :func:`_apply_sheet_names`; ``preferred`` is selected if the workbook has it.
+    """
     sheet_element = window["-SHEET-"]
     sheet_element.update(values=[], value="", disabled=True)
-    STATE.current_sheets = []
+    STATE.current_sheets = frozenset()
+    STATE.sheet_request_path = None
     if not file_path:
         return
 
-    suffix = Path(file_path).suffix.lower()
-    if suffix not in {".xlsx", ".xls"}:
+    if not file_path.lower().endswith(_SHEET_FILE_SUFFIXES):
         return
 
     try:
-        with pd.ExcelFile(file_path) as workbook:
-            sheet_names = workbook.sheet_names
-    except Exception as exc:  # pylint: disable=broad-except
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        # Usually a path still being typed; _prepare_run_params reports it.
+        return
+    except OSError as exc:
         sg.popup_error(f"Não foi possível ler as abas do arquivo: {exc}")
         return
 
+    STATE.sheet_request_path = file_path
+    STATE.preferred_sheet = preferred
+    threading.Thread(
+        target=_discover_sheets,
+        args=(file_path, stat_result.st_mtime_ns, stat_result.st_size),
+        daemon=True,
+    ).start()
+
+
+def _discover_sheets(file_path: str, mtime_ns: int, size: int) -> None:
+    try:
+        sheet_names = _sheet_names_cached(file_path, mtime_ns, size)
+    except Exception as exc:  # pylint: disable=broad-except
+        _post_to_ui("SHEETS", (file_path, (), str(exc)))
+    else:
+        _post_to_ui("SHEETS", (file_path, sheet_names, None))
+
+
+def _apply_sheet_names(
+    window: sg.Window,
+    file_path: str,
+    sheet_names: tuple[str, ...],
+    error: Optional[str],
+) -> None:
+    if file_path != STATE.sheet_request_path:
+        return  # the path changed while the workbook was being read
+    STATE.sheet_request_path = None
+    if error is not None:
+        sg.popup_error(f"Não foi possível ler as abas do arquivo: {error}")
+        return
     if not sheet_names:
         sg.popup_error("Nenhuma aba encontrada no arquivo Excel.")
         return
 
-    sheet_element.update(values=sheet_names, value=sheet_names[0], disabled=False)
-    STATE.current_sheets = sheet_names
+    selected = (
+        STATE.preferred_sheet
+        if STATE.preferred_sheet in sheet_names
+        else sheet_names[0]
+    )
+    window["-SHEET-"].update(values=list(sheet_names), value=selected, disabled=False)
+    STATE.current_sheets = frozenset(sheet_names)
 
 
 class QueueLogHandler(logging.Handler):
     """Handler de logging que envia mensagens para a fila da interface."""
 
-    def __init__(self, message_queue: "queue.Queue[tuple[str, str]]") -> None:
+    def __init__(self) -> None:
         super().__init__()
-        self._queue = message_queue
         self.setLevel(logging.NOTSET)
         self.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        self.dropped = 0
 
     def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover - integração com UI
+        # emit() runs under the handler lock, so ``dropped`` needs no extra locking.
+        if record.levelno < logging.INFO and len(log_queue) >= LOG_QUEUE_SOFT_LIMIT:
+            self.dropped += 1
+            return
         try:
             message = self.format(record)
         except Exception:  # pylint: disable=broad-except
             message = record.getMessage()
-        self._queue.put(("LOG", message + "\n"))
+        if self.dropped:
+            message = (
+                f"[... {self.dropped} mensagens de depuração descartadas ...]\n{message}"
+            )
+            self.dropped = 0
+        _post_to_ui("LOG", message + "\n")
+
+
+def _apply_log_level(values: Mapping[str, object]) -> None:
+    """Set the root logger level from the log-level combo.
+
+    Records below the chosen level are then discarded by the logger itself,
+    before they reach ``QueueLogHandler`` and the UI queue.
+    """
+    level_name = (_field_text(values, "-LOGLEVEL-") or "INFO").upper()
+    logging.getLogger().setLevel(getattr(logging, level_name, logging.INFO))
+
+
+def _install_queue_handler() -> None:
+    global _QUEUE_HANDLER_INSTALLED
+    if _QUEUE_HANDLER_INSTALLED:
+        return
+    logging.getLogger().addHandler(QueueLogHandler())
+    _QUEUE_HANDLER_INSTALLED = True
+
+
+def _configure_log_tags(window: sg.Window) -> None:
+    """Create the log's coloured text tags once, after the window is finalized."""
+    widget = window["-LOG-"].Widget
+    for tag, color in _LOG_TAG_COLORS.items():
+        widget.tag_configure(tag, foreground=color)
 
 
 def append_log(window: sg.Window, text: str, *, tag: str = "OUT") -> None:
-    text_color = "red" if tag == "ERR" else None
-    window["-LOG-"].print(text, end="", text_color=text_color)
+    # Insert straight into the Tk text widget with a pre-configured tag;
+    # Multiline.update(text_color_for_value=...) re-runs tag_configure per call.
+    widget = _element(window, "-LOG-").Widget
+    widget.insert("end", text, tag)
+    widget.see("end")
+
+
+def _flush_log_batch(window: sg.Window, pending: list[str]) -> None:
+    """Print queued log lines with a single widget call and update progress."""
+    if not pending:
+        return
+    text = "".join(pending)
+    pending.clear()
+    append_log(window, text)
+    _handle_progress_from_log(window, text)
+
+
+def _field_text(values: Mapping[str, object], key: str) -> str:
+    """Return a form field as stripped text, treating ``None`` as empty."""
+    value = values.get(key)
+    return str(value).strip() if value is not None else ""
 
 
 def _prepare_run_params(
@@ -761,7 +1016,7 @@ def _prepare_run_params(
     if RunParams is None:
         return None
 
-    excel_path = str(values.get("-EXCEL-", "") or "").strip()
+    excel_path = _field_text(values, "-EXCEL-")
     if not excel_path:
         sg.popup_error("Selecione a planilha (XLSX/CSV).")
         return None
@@ -769,7 +1024,7 @@ def _prepare_run_params(
         sg.popup_error("Arquivo de planilha não encontrado. Verifique o caminho informado.")
         return None
 
-    sheet_value_raw = str(values.get("-SHEET-", "") or "").strip()
+    sheet_value_raw = _field_text(values, "-SHEET-")
     sheet_value = sheet_value_raw or None
     if sheet_value and STATE.current_sheets and sheet_value not in STATE.current_sheets:
         sg.popup_error(
@@ -777,11 +1032,11 @@ def _prepare_run_params(
         )
         return None
 
-    subject_template = str(values.get("-SUBJECT-", "") or "").strip()
-    subject_file_path = str(values.get("-SUBJECTFILE-", "") or "").strip()
+    subject_template = _field_text(values, "-SUBJECT-")
+    subject_file_path = _field_text(values, "-SUBJECTFILE-")
     if subject_file_path:
         try:
-            subject_template = Path(subject_file_path).read_text(encoding="utf-8").strip()
+            subject_template = _read_text_cached(subject_file_path).strip()
         except FileNotFoundError:
             sg.popup_error("Arquivo de assunto informado não foi encontrado.")
             return None
@@ -793,7 +1048,7 @@ def _prepare_run_params(
         sg.popup_error("Informe o assunto (template).")
         return None
 
-    body_html_path = str(values.get("-HTML-", "") or "").strip()
+    body_html_path = _field_text(values, "-HTML-")
     body_html = _read_html_template(body_html_path)
     if body_html is None:
         return None
@@ -805,13 +1060,13 @@ def _prepare_run_params(
         dry_run_override if dry_run_override is not None else bool(values.get("-DRYRUN-", True))
     )
 
-    sender_value = str(values.get("-SENDER-", "") or "").strip()
-    smtp_user_input = str(values.get("-SMTPUSER-", "") or "").strip()
+    sender_value = _field_text(values, "-SENDER-")
+    smtp_user_input = _field_text(values, "-SMTPUSER-")
     smtp_user_value = smtp_user_input or sender_value
 
-    smtp_host_value = str(values.get("-SMTPHOST-", "") or "").strip() or DEFAULT_SMTP_HOST
+    smtp_host_value = _field_text(values, "-SMTPHOST-") or DEFAULT_SMTP_HOST
     use_starttls_value = bool(values.get("-SMTPSTARTTLS-", False))
-    smtp_port_raw = str(values.get("-SMTPPORT-", "") or "").strip()
+    smtp_port_raw = _field_text(values, "-SMTPPORT-")
     default_port = (
         DEFAULT_SMTP_PORT_STARTTLS if use_starttls_value else DEFAULT_SMTP_PORT_SSL
     )
@@ -836,13 +1091,13 @@ def _prepare_run_params(
             return None
 
     try:
-        cc_list = _parse_email_list(str(values.get("-CC-", "") or ""))
-        bcc_list = _parse_email_list(str(values.get("-BCC-", "") or ""))
+        cc_list = _parse_email_list(_field_text(values, "-CC-"))
+        bcc_list = _parse_email_list(_field_text(values, "-BCC-"))
     except ValueError as exc:
         sg.popup_error(str(exc))
         return None
 
-    reply_to_raw = str(values.get("-REPLYTO-", "") or "").strip()
+    reply_to_raw = _field_text(values, "-REPLYTO-")
     reply_to_value: str | None = None
     if reply_to_raw:
         if not EMAIL_PATTERN.match(reply_to_raw):
@@ -857,11 +1112,11 @@ def _prepare_run_params(
         interval_value = 0.75
     interval_value = max(0.0, min(2.0, interval_value))
 
-    log_level_value = str(values.get("-LOGLEVEL-", "INFO") or "INFO").strip().upper()
+    log_level_value = (_field_text(values, "-LOGLEVEL-") or "INFO").upper()
     if log_level_value not in {"DEBUG", "INFO", "WARNING", "ERROR"}:
         log_level_value = "INFO"
 
-    password_input = str(values.get("-SMTPPASS-", "") or "").strip()
+    password_input = _field_text(values, "-SMTPPASS-")
     if not dry_run_value and not (password_input or os.getenv("SMTP_PASSWORD", "").strip()):
         sg.popup_error("Informe a senha SMTP ou defina a variável de ambiente SMTP_PASSWORD.")
         return None
@@ -900,14 +1155,19 @@ def _validate_and_preview(window: sg.Window, values: dict[str, object]) -> bool:
     window["-SUBJECT-"].update(params.subject_template)
 
     try:
-        dataframe = load_contacts(params.input_path, params.sheet)
+        # Validation only needs the header and the preview sample.
+        dataframe = load_contacts(
+            params.input_path, params.sheet, nrows=PREVIEW_SAMPLE_SIZE
+        )
     except ValueError as exc:
         sg.popup_error(str(exc))
         return False
 
     dataframe = _normalize_headers(dataframe)
 
-    missing_required = sorted(REQUIRED_COLUMNS - set(dataframe.columns))
+    # _normalize_headers already lowercased the columns.
+    columns = frozenset(dataframe.columns)
+    missing_required = sorted(REQUIRED_COLUMNS - columns)
     if missing_required:
         sg.popup_error(
             "Planilha inválida. Colunas obrigatórias ausentes: " + ", ".join(missing_required)
@@ -917,9 +1177,7 @@ def _validate_and_preview(window: sg.Window, values: dict[str, object]) -> bool:
     used_placeholders = extract_placeholders(params.subject_template) | extract_placeholders(
         params.body_html
     )
-    available_placeholders = {column.lower() for column in dataframe.columns} | {
-        name.lower() for name in GLOBAL_PLACEHOLDERS
-    }
+    available_placeholders = GLOBAL_PLACEHOLDERS | columns
     missing_placeholders = sorted(
         placeholder
         for placeholder in used_placeholders
@@ -938,10 +1196,21 @@ def _validate_and_preview(window: sg.Window, values: dict[str, object]) -> bool:
         sg.popup_error("A planilha não possui registros para envio.")
         return False
 
-    sample_records = dataframe.head(3).to_dict(orient="records")
+    # Rows only need the columns the templates read (plus the required ones).
+    used_columns = {placeholder.lower() for placeholder in used_placeholders}
+    needed_columns = [
+        column
+        for column in dataframe.columns
+        if column in used_columns or column in REQUIRED_COLUMNS
+    ]
+    sample_records = (
+        dataframe.loc[:, needed_columns]
+        .head(PREVIEW_SAMPLE_SIZE)
+        .fillna("")
+        .to_dict(orient="records")
+    )
     previews: list[dict[str, str]] = []
-    for index, row in enumerate(sample_records, start=1):
-        cleaned_row = {key: ("" if pd.isna(value) else value) for key, value in row.items()}
+    for index, cleaned_row in enumerate(sample_records, start=1):
         try:
             rendered_subject, rendered_body = render(
                 params.subject_template,
@@ -983,555 +1252,637 @@ def _start_worker(window: sg.Window, params: RunParams) -> None:
         except Exception:  # pylint: disable=broad-except
             pass
 
-    append_log(window, "\n[INFO] Iniciando execução\n")
-    append_log(window, f"[INFO] Planilha: {params.input_path}\n")
-    append_log(window, f"[INFO] Sheet: {params.sheet or '(padrão)'}\n")
-    append_log(window, f"[INFO] Remetente: {params.sender or '(não informado)'}\n")
-    append_log(window, f"[INFO] SMTP User: {params.smtp_user or '(não informado)'}\n")
-    append_log(window, f"[INFO] SMTP Host: {params.smtp_host}\n")
-    append_log(window, f"[INFO] SMTP Porta: {params.smtp_port}\n")
-    append_log(
-        window,
+    mode_display = "Dry-run (sem envio real)" if params.dry_run else "Envio real"
+    banner = [
+        "\n[INFO] Iniciando execução\n",
+        f"[INFO] Planilha: {params.input_path}\n",
+        f"[INFO] Sheet: {params.sheet or '(padrão)'}\n",
+        f"[INFO] Remetente: {params.sender or '(não informado)'}\n",
+        f"[INFO] SMTP User: {params.smtp_user or '(não informado)'}\n",
+        f"[INFO] SMTP Host: {params.smtp_host}\n",
+        f"[INFO] SMTP Porta: {params.smtp_port}\n",
         f"[INFO] SMTP Método: {'STARTTLS' if params.use_starttls else 'SSL'}\n",
-    )
+    ]
     if params.cc:
-        append_log(window, f"[INFO] CC: {', '.join(params.cc)}\n")
+        banner.append(f"[INFO] CC: {', '.join(params.cc)}\n")
     if params.bcc:
-        append_log(window, f"[INFO] BCC: {', '.join(params.bcc)}\n")
+        banner.append(f"[INFO] BCC: {', '.join(params.bcc)}\n")
     if params.reply_to:
-        append_log(window, f"[INFO] Reply-To: {params.reply_to}\n")
-    append_log(window, f"[INFO] Intervalo entre envios: {params.interval_seconds:.2f}s\n")
-    append_log(window, f"[INFO] Log level: {params.log_level}\n")
-    mode_display = "Dry-run (sem envio real)" if params.dry_run else "Envio real"
-    append_log(window, f"[INFO] Modo: {mode_display}\n")
-    append_log(window, f"[INFO] Assunto: {params.subject_template}\n")
+        banner.append(f"[INFO] Reply-To: {params.reply_to}\n")
+    banner += [
+        f"[INFO] Intervalo entre envios: {params.interval_seconds:.2f}s\n",
+        f"[INFO] Log level: {params.log_level}\n",
+        f"[INFO] Modo: {mode_display}\n",
+        f"[INFO] Assunto: {params.subject_template}\n",
+    ]
+    # One widget update for the whole banner instead of one per line.
+    append_log(window, "".join(banner))
 
     def _run() -> None:  # pragma: no cover - integração com UI
+        # The UI loop may be blocked without a timeout, so a completion
+        # message must be posted however the worker exits.
+        outcome = ("ERROR", "Execução interrompida.\n")
         try:
-            result_code = run_program(params)
+            outcome = ("RESULT", str(run_program(params)))
         except Exception as exc:  # pylint: disable=broad-except
-            log_queue.put(("ERROR", f"Falha durante a execução: {exc}\n"))
-        else:
-            log_queue.put(("RESULT", str(result_code)))
+            outcome = ("ERROR", f"Falha durante a execução: {exc}\n")
+        finally:
+            _post_to_ui(*outcome)
 
     STATE.worker_thread = threading.Thread(target=_run, daemon=True)
     STATE.worker_thread.start()
 
 
-# -------- UI --------
+def _on_excel_changed(window: sg.Window, values: dict[str, object]) -> None:
+    # Typing a path fires one event per keystroke; the sheet list is refreshed
+    # by _refresh_sheets_if_due once the field has been quiet for a moment.
+    STATE.pending_excel_path = _field_text(values, "-EXCEL-")
+    STATE.excel_changed_at = time.monotonic()
+    _save_settings(values)
 
-# ---- Dimensionamento proporcional à tela ----
-screen_w, screen_h = sg.Window.get_screen_size()
-WIN_W = int(screen_w * 0.75)
-WIN_H = int(screen_h * 0.80)
-LOC_X = (screen_w - WIN_W) // 2
-LOC_Y = (screen_h - WIN_H) // 2
-
-saved_size, saved_loc = load_window_geometry()
-if saved_size and saved_loc:
-    WIN_W, WIN_H = saved_size
-    LOC_X, LOC_Y = saved_loc
-
-layout = [
-    [
-        sg.Text("Planilha (XLSX/CSV)"),
-        sg.Input(key="-EXCEL-", enable_events=True, expand_x=True),
-        sg.FileBrowse(
-            key="-EXCEL-BROWSE-",
-            file_types=(("Excel/CSV", "*.xlsx;*.xls;*.csv"),),
-            button_text="Browse",
-            size=(10, 1),
-        ),
-    ],
-    [
-        sg.Text("Aba (sheet)"),
-        sg.Combo(
-            values=[],
-            key="-SHEET-",
-            size=(25, 1),
-            readonly=True,
-            disabled=True,
-            enable_events=True,
-        ),
-    ],
-    [sg.HorizontalSeparator()],
-    [
-        sg.Text("Remetente (From)"),
-        sg.Input(key="-SENDER-", expand_x=True, enable_events=True),
-    ],
-    [
-        sg.Text("SMTP User"),
-        sg.Input(key="-SMTPUSER-", expand_x=True, enable_events=True),
-    ],
-    [
-        sg.Text(
-            "SMTP Password — Senha de app (recomendado)",
-            tooltip="Gmail exige Senha de app (16 dígitos). Vá em Gerenciar Conta → Segurança → Senhas de app.",
-        ),
-        sg.Input(
-            key="-SMTPPASS-",
-            password_char="*",
-            expand_x=True,
-            tooltip="Gmail exige Senha de app (16 dígitos). Vá em Gerenciar Conta → Segurança → Senhas de app.",
-        ),
-    ],
-    [
-        sg.Text("SMTP Host"),
-        sg.Input(
-            key="-SMTPHOST-",
-            expand_x=True,
-            enable_events=True,
-            default_text=DEFAULT_SMTP_HOST,
-        ),
-        sg.Text("Porta"),
-        sg.Input(
-            key="-SMTPPORT-",
-            size=(6, 1),
-            enable_events=True,
-            default_text=str(DEFAULT_SMTP_PORT_SSL),
-        ),
-        sg.Checkbox(
-            "Usar STARTTLS",
-            key="-SMTPSTARTTLS-",
-            enable_events=True,
-        ),
-        sg.Button("Testar credenciais", key="-SMTPTEST-", size=(18, 1)),
-    ],
-    [sg.Text("CC"), sg.Input(key="-CC-", expand_x=True, enable_events=True)],
-    [sg.Text("BCC"), sg.Input(key="-BCC-", expand_x=True, enable_events=True)],
-    [sg.Text("Reply-To"), sg.Input(key="-REPLYTO-", expand_x=True, enable_events=True)],
-    [sg.HorizontalSeparator()],
-    [
-        sg.Text("Assunto (Jinja2)"),
-        sg.Input(key="-SUBJECT-", expand_x=True, enable_events=True),
-    ],
-    [
-        sg.Text("Assunto por arquivo (.txt)"),
-        sg.Input(key="-SUBJECTFILE-", enable_events=True, expand_x=True),
-        sg.FileBrowse(
-            key="-SUBJECTFILE-BROWSE-",
-            file_types=(("Texto", "*.txt;*.jinja;*.j2"),),
-            button_text="Browse",
-            size=(10, 1),
-        ),
-    ],
-    [
-        sg.Text("Template HTML"),
-        sg.Input(key="-HTML-", enable_events=True, expand_x=True),
-        sg.FileBrowse(
-            key="-HTML-BROWSE-",
-            file_types=(("HTML", "*.html;*.htm;*.j2"),),
-            button_text="Browse",
-            size=(10, 1),
-        ),
-        sg.Button("Prévia", key="-TPLPREVIEW-", size=(10, 1)),
-    ],
-    [
-        sg.Checkbox(
-            "Dry-run (não enviar, apenas pré-visualizar)",
-            key="-DRYRUN-",
-            default=True,
-            enable_events=True,
-        )
-    ],
-    [
-        sg.Text("Intervalo entre envios (segundos)"),
-        sg.Slider(
-            range=(0.0, 2.0),
-            resolution=0.05,
-            default_value=0.75,
-            orientation="h",
-            key="-INTERVAL-",
-            enable_events=True,
-            size=(30, 15),
-        ),
-        sg.Text("0.75s", key="-INTERVAL-LABEL-", size=(10, 1)),
-    ],
-    [
-        sg.Text("Log level"),
-        sg.Combo(
-            values=["INFO", "DEBUG", "WARNING", "ERROR"],
-            default_value="INFO",
-            key="-LOGLEVEL-",
-            readonly=True,
-            size=(15, 1),
-            enable_events=True,
-        ),
-    ],
-    [sg.HorizontalSeparator()],
-    [
-        sg.ProgressBar(
-            max_value=1,
-            orientation="h",
-            size=(40, 20),
-            key="-PROGRESS-",
-            visible=False,
-            bar_color=("#1f77b4", "#e0e0e0"),
-            expand_x=True,
-        ),
-        sg.Text("Pronto", key="-STATUS-", size=(20, 1)),
-        sg.Text("0/0", key="-COUNTER-", size=(10, 1)),
-    ],
-    [
-        sg.Button("Validar & Prévia", key="-VALIDATE-", size=(16, 1)),
-        sg.Button("Abrir última prévia", key="-OPEN-LAST-PREVIEW-", size=(18, 1)),
-        sg.Button(
-            "Enviar",
-            key="-RUN-",
-            size=(12, 1),
-            bind_return_key=True,
-            disabled=True,
-        ),
-        sg.Button("Cancelar", key="-CANCEL-", size=(12, 1), disabled=True),
-        sg.Button("Sair", key="-EXIT-", size=(8, 1)),
-    ],
-    [
-        sg.Multiline(
-            key="-LOG-",
-            autoscroll=True,
-            write_only=True,
-            font=("Consolas", 10),
-            expand_x=True,
-            expand_y=True,
-            reroute_stdout=False,
-            reroute_stderr=False,
+
+def _refresh_sheets_if_due(window: sg.Window, *, force: bool = False) -> None:
+    excel_path = STATE.pending_excel_path
+    if excel_path is None:
+        return
+    if not force and time.monotonic() - STATE.excel_changed_at < SHEET_REFRESH_DELAY:
+        return
+    STATE.pending_excel_path = None
+    _update_sheet_combo(window, excel_path)
+
+
+def _on_setting_changed(window: sg.Window, values: dict[str, object]) -> None:
+    _save_settings(values)
+
+
+def _on_log_level_changed(window: sg.Window, values: dict[str, object]) -> None:
+    _apply_log_level(values)
+    _save_settings(values)
+
+
+def _on_starttls_toggled(window: sg.Window, values: dict[str, object]) -> None:
+    use_starttls = bool(values.get("-SMTPSTARTTLS-", False))
+    current_port = _field_text(values, "-SMTPPORT-")
+    if current_port in {"", str(DEFAULT_SMTP_PORT_SSL), str(DEFAULT_SMTP_PORT_STARTTLS)}:
+        new_port = (
+            str(DEFAULT_SMTP_PORT_STARTTLS)
+            if use_starttls
+            else str(DEFAULT_SMTP_PORT_SSL)
         )
-    ],
-]
-
-window = sg.Window(
-    "Emaileria — Envio de E-mails",
-    layout,
-    size=(WIN_W, WIN_H),
-    resizable=True,
-    finalize=True,
-    location=(LOC_X, LOC_Y),
-    element_justification="left",
-    keep_on_top=False,
-)
-_update_interval_display(window, float(window["-INTERVAL-"].DefaultValue))
-window["-COUNTER-"].update("0/0")
-_apply_saved_settings(window)
-try:
-    current_interval_value = float(window["-INTERVAL-"].Widget.get())
-except Exception:  # pylint: disable=broad-except
-    current_interval_value = float(window["-INTERVAL-"].DefaultValue)
-_update_interval_display(window, current_interval_value)
-_set_validation_state(window, passed=False)
-
-log_queue: "queue.Queue[tuple[str, str]]" = queue.Queue()
-queue_handler = QueueLogHandler(log_queue)
-root_logger = logging.getLogger()
-if not any(isinstance(handler, QueueLogHandler) for handler in root_logger.handlers):
-    root_logger.addHandler(queue_handler)
-root_logger.setLevel(logging.INFO)
-
-if IMPORT_ERROR is not None:
-    append_log(
-        window,
-        "[ERR] Não foi possível importar email_sender. Execute este programa a partir da raiz do projeto.\n",
-        tag="ERR",
-    )
-    append_log(window, f"[ERR] Detalhes: {IMPORT_ERROR}\n", tag="ERR")
+        window["-SMTPPORT-"].update(new_port)
+        values["-SMTPPORT-"] = new_port
+    _save_settings(values)
 
-while True:
-    event, values = window.read(timeout=100)
-    if event in (sg.WIN_CLOSED, "-EXIT-"):
-        _save_settings(values)
-        save_window_geometry(window)
-        break
 
-    if event in _VALIDATION_RESET_EVENTS:
-        _set_validation_state(window, passed=False)
+def _on_interval_changed(window: sg.Window, values: dict[str, object]) -> None:
+    try:
+        slider_value = float(values["-INTERVAL-"])
+    except (TypeError, ValueError):
+        slider_value = 0.75
+    _update_interval_display(window, slider_value)
+    _save_settings(values)
 
-    if event == "-EXCEL-":
-        excel_path = values["-EXCEL-"].strip()
-        _update_sheet_combo(window, excel_path)
-        _save_settings(values)
 
-    if event == "-SHEET-":
-        _save_settings(values)
+def _on_smtp_test(window: sg.Window, values: dict[str, object]) -> None:
+    _test_smtp_credentials(window, values)
+    _save_settings(values)
 
-    if event in {
-        "-SENDER-",
-        "-SMTPUSER-",
-        "-SMTPHOST-",
-        "-SMTPPORT-",
-        "-CC-",
-        "-BCC-",
-        "-REPLYTO-",
-    }:
-        _save_settings(values)
 
-    if event == "-SMTPSTARTTLS-":
-        use_starttls = bool(values.get("-SMTPSTARTTLS-", False))
-        current_port = str(values.get("-SMTPPORT-", "") or "").strip()
-        if current_port in {"", str(DEFAULT_SMTP_PORT_SSL), str(DEFAULT_SMTP_PORT_STARTTLS)}:
-            new_port = (
-                str(DEFAULT_SMTP_PORT_STARTTLS)
-                if use_starttls
-                else str(DEFAULT_SMTP_PORT_SSL)
-            )
-            window["-SMTPPORT-"].update(new_port)
-            values["-SMTPPORT-"] = new_port
+def _on_subject_file_selected(window: sg.Window, values: dict[str, object]) -> None:
+    subject_file_path = _field_text(values, "-SUBJECTFILE-")
+    if not subject_file_path:
+        return
+    try:
+        subject_text = _read_text_cached(subject_file_path).strip()
+    except FileNotFoundError:
+        return
+    except OSError as exc:
+        sg.popup_error(f"Erro ao ler o arquivo de assunto: {exc}")
+    else:
+        values["-SUBJECT-"] = subject_text
+        window["-SUBJECT-"].update(subject_text)
         _save_settings(values)
 
-    if event == "-HTML-":
-        _save_settings(values)
 
-    if event == "-DRYRUN-":
-        _save_settings(values)
+@lru_cache(maxsize=1)
+def _preview_environment() -> Environment:
+    class SoftUndefined(Undefined):
+        def _fail_with_undefined_error(self, *args, **kwargs):  # type: ignore[override]
+            return ""
 
-    if event == "-LOGLEVEL-":
-        _save_settings(values)
+    return Environment(
+        undefined=SoftUndefined,
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
 
-    if event == "-INTERVAL-":
-        try:
-            slider_value = float(values["-INTERVAL-"])
-        except (TypeError, ValueError):
-            slider_value = 0.75
-        _update_interval_display(window, slider_value)
-        _save_settings(values)
 
-    if event == "-SMTPTEST-":
-        _test_smtp_credentials(window, values)
-        _save_settings(values)
-        continue
+@lru_cache(maxsize=16)
+def _compile_preview_template(source: str) -> Template:
+    """Compile a template for the quick preview once per distinct source."""
+    return _preview_environment().from_string(source)
+
+
+def _on_template_preview(window: sg.Window, values: dict[str, object]) -> None:
+    path_html = _field_text(values, "-HTML-")
+    path_excel = _field_text(values, "-EXCEL-")
+    sheet = _field_text(values, "-SHEET-")
+    subject_tpl = _field_text(values, "-SUBJECT-") or "Prévia de Template"
+
+    if not path_html or not Path(path_html).exists():
+        sg.popup_error("Selecione um arquivo de Template HTML válido.")
+        return
+
+    try:
+        previews_list: list[dict[str, object]] = []
+        body_html = _read_text_cached(path_html)
+
+        subject_compiled = _compile_preview_template(subject_tpl)
+        body_compiled = _compile_preview_template(body_html)
 
-    if event == "-SUBJECTFILE-":
-        subject_file_path = str(values.get("-SUBJECTFILE-", "") or "").strip()
-        if subject_file_path and Path(subject_file_path).exists():
+        from datetime import datetime, date
+
+
+        globals_ctx = {
+            "now": datetime.now(),
+            "hoje": date.today(),
+            "data_envio": date.today().strftime("%Y-%m-%d"),
+            "hora_envio": datetime.now().strftime("%H:%M"),
+        }
+
+        def render_preview(context: dict[str, object] | None) -> tuple[str, str]:
+            ctx = {**globals_ctx, **(context or {})}
+            rendered_subject = subject_compiled.render(ctx)
+            rendered_html = body_compiled.render(ctx)
+            return str(rendered_subject or ""), str(rendered_html or "")
+
+        rows_for_preview: list[dict[str, object]] = []
+        if path_excel and Path(path_excel).exists():
             try:
-                subject_text = Path(subject_file_path).read_text(encoding="utf-8").strip()
-            except OSError as exc:
-                sg.popup_error(f"Erro ao ler o arquivo de assunto: {exc}")
+                if load_contacts is None:
+                    raise ImportError("loader indisponível")
+                dataframe = load_contacts(
+                    path_excel, sheet or None, nrows=PREVIEW_SAMPLE_SIZE
+                )
+            except Exception:
+                data_path = Path(path_excel)
+                if data_path.suffix.lower() == ".csv":
+                    dataframe = pd.read_csv(
+                        data_path, dtype=str, nrows=PREVIEW_SAMPLE_SIZE
+                    ).fillna("")
+                else:
+                    if sheet:
+                        dataframe = pd.read_excel(
+                            data_path, sheet_name=sheet, dtype=str, nrows=PREVIEW_SAMPLE_SIZE
+                        ).fillna("")
+                    else:
+                        excel_file = pd.ExcelFile(data_path)
+                        dataframe = pd.read_excel(
+                            excel_file,
+                            sheet_name=excel_file.sheet_names[0],
+                            dtype=str,
+                            nrows=PREVIEW_SAMPLE_SIZE,
+                        ).fillna("")
             else:
-                values["-SUBJECT-"] = subject_text
-                window["-SUBJECT-"].update(subject_text)
-                _save_settings(values)
-
-    if event == "-TPLPREVIEW-":
-        path_html = str(values.get("-HTML-", "") or "").strip()
-        path_excel = str(values.get("-EXCEL-", "") or "").strip()
-        sheet_raw = values.get("-SHEET-")
-        sheet = ""
-        if isinstance(sheet_raw, str):
-            sheet = sheet_raw.strip()
-        elif sheet_raw is not None:
-            sheet = str(sheet_raw).strip()
-        subject_tpl = str(values.get("-SUBJECT-", "") or "").strip() or "Prévia de Template"
-        sender = str(values.get("-SENDER-", "") or "").strip()
-        smtp_user = str(values.get("-SMTPUSER-", "") or "").strip()
-        _ = sender, smtp_user
-
-        if not path_html or not Path(path_html).exists():
-            sg.popup_error("Selecione um arquivo de Template HTML válido.")
-            continue
+                dataframe = dataframe.fillna("")
+
+            rows_for_preview = dataframe.head(PREVIEW_SAMPLE_SIZE).to_dict(orient="records")
+
+        if not rows_for_preview:
+            rows_for_preview = [{}]
+
+        for idx, row in enumerate(rows_for_preview, start=1):
+            subj_rendered, html_rendered = render_preview(
+                row if isinstance(row, dict) else {}
+            )
+            email_display = "(sem e-mail)"
+            if isinstance(row, dict):
+                email_value = row.get("email", "")
+                email_display = str(email_value or "") or "(sem e-mail)"
+            previews_list.append(
+                {
+                    "idx": idx,
+                    "subject": subj_rendered,
+                    "body_html": html_rendered,
+                    "email": email_display,
+                }
+            )
 
+        index = build_preview_page(previews_list)
+        STATE.last_preview_path = index
         try:
-            previews_list: list[dict[str, object]] = []
-            body_html = Path(path_html).read_text(encoding="utf-8")
+            open_preview_window(index)
+        except Exception:
+            import webbrowser
 
-            from jinja2 import Environment, Undefined
+            webbrowser.open(index.resolve().as_uri())
+    except Exception as exc:  # pylint: disable=broad-except
+        sg.popup_error(f"Falha ao gerar prévia do Template HTML:\n{exc}")
 
 
-            class SoftUndefined(Undefined):
-                def _fail_with_undefined_error(self, *args, **kwargs):  # type: ignore[override]
-                    return ""
+def _ensure_can_start() -> bool:
+    if IMPORT_ERROR is not None:
+        sg.popup_error(
+            "Não foi possível importar o módulo email_sender. "
+            "Execute este programa a partir da raiz do projeto.\n"
+            f"Detalhes: {IMPORT_ERROR}"
+        )
+        return False
+    if STATE.worker_thread is not None and STATE.worker_thread.is_alive():
+        sg.popup_error("Já existe um envio em andamento. Aguarde a finalização.")
+        return False
+    return True
 
 
-            env_preview = Environment(
-                undefined=SoftUndefined,
-                autoescape=False,
-                trim_blocks=True,
-                lstrip_blocks=True,
-            )
+def _on_validate(window: sg.Window, values: dict[str, object]) -> None:
+    if not _ensure_can_start():
+        return
+    if _validate_and_preview(window, values):
+        _set_validation_state(window, passed=True)
+        _save_settings(values)
+
 
-            from datetime import datetime, date
+def _on_open_last_preview(window: sg.Window, values: dict[str, object]) -> None:
+    candidate = STATE.last_preview_path
+    if candidate is None or not candidate.exists():
+        candidate = _find_latest_preview()
+    if candidate is None or not candidate.exists():
+        sg.popup_error("Nenhuma prévia foi gerada ainda.")
+    else:
+        STATE.last_preview_path = candidate
+        open_preview_window(candidate)
 
 
-            globals_ctx = {
-                "now": datetime.now(),
-                "hoje": date.today(),
-                "data_envio": date.today().strftime("%Y-%m-%d"),
-                "hora_envio": datetime.now().strftime("%H:%M"),
-            }
+def _on_run(window: sg.Window, values: dict[str, object]) -> None:
+    if not _ensure_can_start():
+        return
+    params = _prepare_run_params(values)
+    if params is None:
+        return
+    window["-SUBJECT-"].update(params.subject_template)
+    _save_settings(values)
+    _set_running_state(window, running=True)
+    _start_worker(window, params)
 
-            def render_preview(context: dict[str, object] | None) -> tuple[str, str]:
-                ctx = {**globals_ctx, **(context or {})}
-                rendered_subject = env_preview.from_string(subject_tpl).render(ctx)
-                rendered_html = env_preview.from_string(body_html).render(ctx)
-                return str(rendered_subject or ""), str(rendered_html or "")
 
-            rows_for_preview: list[dict[str, object]] = []
-            if path_excel and Path(path_excel).exists():
+def _on_cancel(window: sg.Window, values: dict[str, object]) -> None:
+    if STATE.worker_thread is not None and STATE.worker_thread.is_alive():
+        if not STATE.cancel_flag:
+            append_log(
+                window,
+                "[INFO] Cancelamento solicitado. Aguarde a finalização.\n",
+            )
+            STATE.cancel_flag = True
+            if email_sender_module is not None and hasattr(
+                email_sender_module, "request_cancel"
+            ):
                 try:
-                    if load_contacts is None:
-                        raise ImportError("loader indisponível")
-                    dataframe = load_contacts(path_excel, sheet or None)
-                except Exception:
-                    data_path = Path(path_excel)
-                    if data_path.suffix.lower() == ".csv":
-                        dataframe = pd.read_csv(data_path, dtype=str).fillna("")
-                    else:
-                        if sheet:
-                            dataframe = pd.read_excel(
-                                data_path, sheet_name=sheet, dtype=str
-                            ).fillna("")
-                        else:
-                            excel_file = pd.ExcelFile(data_path)
-                            dataframe = pd.read_excel(
-                                excel_file, sheet_name=excel_file.sheet_names[0], dtype=str
-                            ).fillna("")
-                else:
-                    dataframe = dataframe.fillna("")
+                    email_sender_module.request_cancel()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+        window["-CANCEL-"].update(disabled=True)
+    else:
+        window["-CANCEL-"].update(disabled=True)
+
+
+_EVENT_HANDLERS: dict[str, Callable[[sg.Window, dict[str, object]], None]] = {
+    "-EXCEL-": _on_excel_changed,
+    "-SHEET-": _on_setting_changed,
+    "-SENDER-": _on_setting_changed,
+    "-SMTPUSER-": _on_setting_changed,
+    "-SMTPHOST-": _on_setting_changed,
+    "-SMTPPORT-": _on_setting_changed,
+    "-CC-": _on_setting_changed,
+    "-BCC-": _on_setting_changed,
+    "-REPLYTO-": _on_setting_changed,
+    "-HTML-": _on_setting_changed,
+    "-DRYRUN-": _on_setting_changed,
+    "-LOGLEVEL-": _on_log_level_changed,
+    "-SMTPSTARTTLS-": _on_starttls_toggled,
+    "-INTERVAL-": _on_interval_changed,
+    "-SMTPTEST-": _on_smtp_test,
+    "-SUBJECTFILE-": _on_subject_file_selected,
+    "-TPLPREVIEW-": _on_template_preview,
+    "-VALIDATE-": _on_validate,
+    "-OPEN-LAST-PREVIEW-": _on_open_last_preview,
+    "-RUN-": _on_run,
+    "-CANCEL-": _on_cancel,
+}
+
 
-                rows_for_preview = dataframe.head(3).to_dict(orient="records")
+_PASSIVE_EVENTS = frozenset({sg.TIMEOUT_KEY, LOG_READY_EVENT, "-EXCEL-"})
 
-            if not rows_for_preview:
-                rows_for_preview = [{}]
 
-            for idx, row in enumerate(rows_for_preview, start=1):
-                subj_rendered, html_rendered = render_preview(
-                    row if isinstance(row, dict) else {}
+def _drain_log_queue(window: sg.Window) -> None:
+    _log_wakeup_pending.clear()
+    pending_logs: list[str] = []
+    while log_queue:
+        tag, payload = log_queue.popleft()
+        if tag == "LOG":
+            pending_logs.append(payload)
+            continue
+        _flush_log_batch(window, pending_logs)
+        if tag == "SHEETS":
+            _apply_sheet_names(window, *payload)
+        elif tag == "ERROR":
+            append_log(window, payload, tag="ERR")
+            STATE.worker_thread = None
+            _set_running_state(window, running=False)
+        elif tag == "RESULT":
+            STATE.worker_thread = None
+            _set_running_state(window, running=False)
+            try:
+                code = int(payload)
+            except (TypeError, ValueError):
+                code = 1
+            auth_exit_code = 5
+            if email_sender_module is not None:
+                auth_exit_code = int(
+                    getattr(email_sender_module, "AUTHENTICATION_ERROR_EXIT_CODE", 5)
                 )
-                email_display = "(sem e-mail)"
-                if isinstance(row, dict):
-                    email_value = row.get("email", "")
-                    email_display = str(email_value or "") or "(sem e-mail)"
-                previews_list.append(
-                    {
-                        "idx": idx,
-                        "subject": subj_rendered,
-                        "body_html": html_rendered,
-                        "email": email_display,
-                    }
+            if code == 0:
+                append_log(
+                    window,
+                    "\n[INFO] Execução finalizada com sucesso (código 0)\n",
                 )
+            elif code == 130:
+                append_log(window, "\n[INFO] Execução cancelada pelo usuário.\n")
+            elif code == auth_exit_code:
+                append_log(
+                    window,
+                    "\n[ERR] Falha na autenticação SMTP detectada.\n",
+                    tag="ERR",
+                )
+                sg.popup_error(
+                    "Falha na autenticação. Clique em Testar credenciais para corrigir.",
+                    title="Erro de autenticação SMTP",
+                )
+            else:
+                append_log(
+                    window,
+                    f"\n[ERR] Execução finalizada com código {code}\n",
+                    tag="ERR",
+                )
+    _flush_log_batch(window, pending_logs)
 
-            index = build_preview_page(previews_list)
-            STATE.last_preview_path = index
-            try:
-                open_preview_window(index)
-            except Exception:
-                import webbrowser
 
-                webbrowser.open(index.resolve().as_uri())
-        except Exception as exc:  # pylint: disable=broad-except
-            sg.popup_error(f"Falha ao gerar prévia do Template HTML:\n{exc}")
-        continue
-
-    if event == "-VALIDATE-":
-        if IMPORT_ERROR is not None:
-            sg.popup_error(
-                "Não foi possível importar o módulo email_sender. "
-                "Execute este programa a partir da raiz do projeto.\n"
-                f"Detalhes: {IMPORT_ERROR}"
+# -------- UI --------
+
+
+def main() -> None:
+    # ---- Dimensionamento proporcional à tela ----
+    screen_w, screen_h = sg.Window.get_screen_size()
+    WIN_W = int(screen_w * 0.75)
+    WIN_H = int(screen_h * 0.80)
+    LOC_X = (screen_w - WIN_W) // 2
+    LOC_Y = (screen_h - WIN_H) // 2
+
+    saved_size, saved_loc = load_window_geometry()
+    if saved_size and saved_loc:
+        WIN_W, WIN_H = saved_size
+        LOC_X, LOC_Y = saved_loc
+
+    layout = [
+        [
+            sg.Text("Planilha (XLSX/CSV)"),
+            sg.Input(key="-EXCEL-", enable_events=True, expand_x=True),
+            sg.FileBrowse(
+                key="-EXCEL-BROWSE-",
+                file_types=(("Excel/CSV", "*.xlsx;*.xls;*.csv"),),
+                button_text="Browse",
+                size=(10, 1),
+            ),
+        ],
+        [
+            sg.Text("Aba (sheet)"),
+            sg.Combo(
+                values=[],
+                key="-SHEET-",
+                size=(25, 1),
+                readonly=True,
+                disabled=True,
+                enable_events=True,
+            ),
+        ],
+        [sg.HorizontalSeparator()],
+        [
+            sg.Text("Remetente (From)"),
+            sg.Input(key="-SENDER-", expand_x=True, enable_events=True),
+        ],
+        [
+            sg.Text("SMTP User"),
+            sg.Input(key="-SMTPUSER-", expand_x=True, enable_events=True),
+        ],
+        [
+            sg.Text(
+                "SMTP Password — Senha de app (recomendado)",
+                tooltip="Gmail exige Senha de app (16 dígitos). Vá em Gerenciar Conta → Segurança → Senhas de app.",
+            ),
+            sg.Input(
+                key="-SMTPPASS-",
+                password_char="*",
+                expand_x=True,
+                tooltip="Gmail exige Senha de app (16 dígitos). Vá em Gerenciar Conta → Segurança → Senhas de app.",
+            ),
+        ],
+        [
+            sg.Text("SMTP Host"),
+            sg.Input(
+                key="-SMTPHOST-",
+                expand_x=True,
+                enable_events=True,
+                default_text=DEFAULT_SMTP_HOST,
+            ),
+            sg.Text("Porta"),
+            sg.Input(
+                key="-SMTPPORT-",
+                size=(6, 1),
+                enable_events=True,
+                default_text=str(DEFAULT_SMTP_PORT_SSL),
+            ),
+            sg.Checkbox(
+                "Usar STARTTLS",
+                key="-SMTPSTARTTLS-",
+                enable_events=True,
+            ),
+            sg.Button("Testar credenciais", key="-SMTPTEST-", size=(18, 1)),
+        ],
+        [sg.Text("CC"), sg.Input(key="-CC-", expand_x=True, enable_events=True)],
+        [sg.Text("BCC"), sg.Input(key="-BCC-", expand_x=True, enable_events=True)],
+        [sg.Text("Reply-To"), sg.Input(key="-REPLYTO-", expand_x=True, enable_events=True)],
+        [sg.HorizontalSeparator()],
+        [
+            sg.Text("Assunto (Jinja2)"),
+            sg.Input(key="-SUBJECT-", expand_x=True, enable_events=True),
+        ],
+        [
+            sg.Text("Assunto por arquivo (.txt)"),
+            sg.Input(key="-SUBJECTFILE-", enable_events=True, expand_x=True),
+            sg.FileBrowse(
+                key="-SUBJECTFILE-BROWSE-",
+                file_types=(("Texto", "*.txt;*.jinja;*.j2"),),
+                button_text="Browse",
+                size=(10, 1),
+            ),
+        ],
+        [
+            sg.Text("Template HTML"),
+            sg.Input(key="-HTML-", enable_events=True, expand_x=True),
+            sg.FileBrowse(
+                key="-HTML-BROWSE-",
+                file_types=(("HTML", "*.html;*.htm;*.j2"),),
+                button_text="Browse",
+                size=(10, 1),
+            ),
+            sg.Button("Prévia", key="-TPLPREVIEW-", size=(10, 1)),
+        ],
+        [
+            sg.Checkbox(
+                "Dry-run (não enviar, apenas pré-visualizar)",
+                key="-DRYRUN-",
+                default=True,
+                enable_events=True,
             )
-            continue
-        if STATE.worker_thread is not None and STATE.worker_thread.is_alive():
-            sg.popup_error("Já existe um envio em andamento. Aguarde a finalização.")
-            continue
-        if _validate_and_preview(window, values):
-            _set_validation_state(window, passed=True)
-            _save_settings(values)
-        continue
-
-    if event == "-OPEN-LAST-PREVIEW-":
-        candidate = STATE.last_preview_path
-        if candidate is None or not candidate.exists():
-            candidate = _find_latest_preview()
-        if candidate is None or not candidate.exists():
-            sg.popup_error("Nenhuma prévia foi gerada ainda.")
-        else:
-            STATE.last_preview_path = candidate
-            open_preview_window(candidate)
-        continue
-
-    if event == "-RUN-":
-        if IMPORT_ERROR is not None:
-            sg.popup_error(
-                "Não foi possível importar o módulo email_sender. "
-                "Execute este programa a partir da raiz do projeto.\n"
-                f"Detalhes: {IMPORT_ERROR}"
+        ],
+        [
+            sg.Text("Intervalo entre envios (segundos)"),
+            sg.Slider(
+                range=(0.0, 2.0),
+                resolution=0.05,
+                default_value=0.75,
+                orientation="h",
+                key="-INTERVAL-",
+                enable_events=True,
+                size=(30, 15),
+            ),
+            sg.Text("0.75s", key="-INTERVAL-LABEL-", size=(10, 1)),
+        ],
+        [
+            sg.Text("Log level"),
+            sg.Combo(
+                values=["INFO", "DEBUG", "WARNING", "ERROR"],
+                default_value="INFO",
+                key="-LOGLEVEL-",
+                readonly=True,
+                size=(15, 1),
+                enable_events=True,
+            ),
+        ],
+        [sg.HorizontalSeparator()],
+        [
+            sg.ProgressBar(
+                max_value=1,
+                orientation="h",
+                size=(40, 20),
+                key="-PROGRESS-",
+                visible=False,
+                bar_color=("#1f77b4", "#e0e0e0"),
+                expand_x=True,
+            ),
+            sg.Text("Pronto", key="-STATUS-", size=(20, 1)),
+            sg.Text("0/0", key="-COUNTER-", size=(10, 1)),
+        ],
+        [
+            sg.Button("Validar & Prévia", key="-VALIDATE-", size=(16, 1)),
+            sg.Button("Abrir última prévia", key="-OPEN-LAST-PREVIEW-", size=(18, 1)),
+            sg.Button(
+                "Enviar",
+                key="-RUN-",
+                size=(12, 1),
+                bind_return_key=True,
+                disabled=True,
+            ),
+            sg.Button("Cancelar", key="-CANCEL-", size=(12, 1), disabled=True),
+            sg.Button("Sair", key="-EXIT-", size=(8, 1)),
+        ],
+        [
+            sg.Multiline(
+                key="-LOG-",
+                autoscroll=True,
+                write_only=True,
+                font=("Consolas", 10),
+                expand_x=True,
+                expand_y=True,
+                reroute_stdout=False,
+                reroute_stderr=False,
             )
-            continue
-        if STATE.worker_thread is not None and STATE.worker_thread.is_alive():
-            sg.popup_error("Já existe um envio em andamento. Aguarde a finalização.")
-            continue
-        params = _prepare_run_params(values)
-        if params is None:
-            continue
-        window["-SUBJECT-"].update(params.subject_template)
-        _save_settings(values)
-        _set_running_state(window, running=True)
-        _start_worker(window, params)
-        continue
+        ],
+    ]
+
+    window = sg.Window(
+        "Emaileria — Envio de E-mails",
+        layout,
+        size=(WIN_W, WIN_H),
+        resizable=True,
+        finalize=True,
+        location=(LOC_X, LOC_Y),
+        element_justification="left",
+        keep_on_top=False,
+    )
+    window["-COUNTER-"].update("0/0")
+    STATE.interactive_elements = _resolve_interactive_elements(window)
+    STATE.elements = _resolve_hot_elements(window)
+    _configure_log_tags(window)
+    # Set before restoring settings: the sheet lookup it starts wakes the
+    # loop through STATE.window when it finishes.
+    STATE.window = window
+    _apply_saved_settings(window)
+    try:
+        current_interval_value = float(window["-INTERVAL-"].Widget.get())
+    except Exception:  # pylint: disable=broad-except
+        current_interval_value = float(window["-INTERVAL-"].DefaultValue)
+    _update_interval_display(window, current_interval_value)
+    _set_validation_state(window, passed=False)
 
-    if event == "-CANCEL-":
-        if STATE.worker_thread is not None and STATE.worker_thread.is_alive():
-            if not STATE.cancel_flag:
-                append_log(
-                    window,
-                    "[INFO] Cancelamento solicitado. Aguarde a finalização.\n",
-                )
-                STATE.cancel_flag = True
-                if email_sender_module is not None and hasattr(
-                    email_sender_module, "request_cancel"
-                ):
-                    try:
-                        email_sender_module.request_cancel()
-                    except Exception:  # pylint: disable=broad-except
-                        pass
-            window["-CANCEL-"].update(disabled=True)
+    _install_queue_handler()
+    _apply_log_level({"-LOGLEVEL-": window["-LOGLEVEL-"].get()})
+
+    if IMPORT_ERROR is not None:
+        append_log(
+            window,
+            "[ERR] Não foi possível importar email_sender. Execute este programa a partir da raiz do projeto.\n",
+            tag="ERR",
+        )
+        append_log(window, f"[ERR] Detalhes: {IMPORT_ERROR}\n", tag="ERR")
+
+    while True:
+        # Worker output and completion wake the loop through LOG_READY_EVENT.
+        # The timeout is only a safety net while a send runs and the cadence
+        # for flushing dirty settings; an idle window just waits for events.
+        if STATE.pending_excel_path is not None:
+            timeout: Optional[int] = int(SHEET_REFRESH_DELAY * 1000)
+        elif STATE.worker_thread is None and not STATE.settings_dirty:
+            timeout = None
         else:
-            window["-CANCEL-"].update(disabled=True)
+            timeout = 1000
+        event, values = window.read(timeout=timeout)
+        if event in (sg.WIN_CLOSED, "-EXIT-"):
+            _save_settings(values)
+            save_window_geometry(window)
+            _flush_settings(force=True)
+            break
+
+        if event in _VALIDATION_RESET_EVENTS:
+            _set_validation_state(window, passed=False)
+
+        # Any other user action must see the sheet list for the current path.
+        if STATE.pending_excel_path is not None and event not in _PASSIVE_EVENTS:
+            _refresh_sheets_if_due(window, force=True)
+            values["-SHEET-"] = window["-SHEET-"].get()
+
+        handler = _EVENT_HANDLERS.get(event)
+        if handler is not None:
+            handler(window, values)
+
+        _drain_log_queue(window)
+        _refresh_sheets_if_due(window)
+        _flush_settings()
+
+    STATE.window = None
+    STATE.elements = {}
+    window.close()
 
-    try:
-        while True:
-            tag, payload = log_queue.get_nowait()
-            if tag == "LOG":
-                append_log(window, payload)
-                _handle_progress_from_log(window, payload)
-            elif tag == "ERROR":
-                append_log(window, payload, tag="ERR")
-                STATE.worker_thread = None
-                _set_running_state(window, running=False)
-            elif tag == "RESULT":
-                STATE.worker_thread = None
-                _set_running_state(window, running=False)
-                try:
-                    code = int(payload)
-                except (TypeError, ValueError):
-                    code = 1
-                auth_exit_code = 5
-                if email_sender_module is not None:
-                    auth_exit_code = int(
-                        getattr(email_sender_module, "AUTHENTICATION_ERROR_EXIT_CODE", 5)
-                    )
-                if code == 0:
-                    append_log(
-                        window,
-                        "\n[INFO] Execução finalizada com sucesso (código 0)\n",
-                    )
-                elif code == 130:
-                    append_log(window, "\n[INFO] Execução cancelada pelo usuário.\n")
-                elif code == auth_exit_code:
-                    append_log(
-                        window,
-                        "\n[ERR] Falha na autenticação SMTP detectada.\n",
-                        tag="ERR",
-                    )
-                    sg.popup_error(
-                        "Falha na autenticação. Clique em Testar credenciais para corrigir.",
-                        title="Erro de autenticação SMTP",
-                    )
-                else:
-                    append_log(
-                        window,
-                        f"\n[ERR] Execução finalizada com código {code}\n",
-                        tag="ERR",
-                    )
-    except queue.Empty:
-        pass
 
-window.close()
+if __name__ == "__main__":
+    main()
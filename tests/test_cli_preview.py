@@ -40,10 +40,11 @@ def test_preview_command_generates_gallery(tmp_path, monkeypatch):
 
     contacts_df = _fake_contacts()
 
-    def fake_load_contacts(path: Path, sheet: str | None = None):
+    def fake_load_contacts(path: Path, sheet: str | None = None, *, nrows: int | None = None):
         assert path == excel_path
         assert sheet is None
-        return contacts_df.copy()
+        assert nrows == 1
+        return contacts_df.head(nrows).copy()
 
     monkeypatch.setattr(cli_module, "load_contacts", fake_load_contacts)
 
@@ -0,0 +1,182 @@
+"""Tests for the streaming contact loader."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from emaileria.datasource.excel import iter_contacts, list_sheet_names, load_contacts
+
+
+def _write_workbook(path: Path, rows: list[tuple[object, ...]]) -> None:
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Leads"
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def test_iter_contacts_streams_xlsx_rows(tmp_path):
+    excel_path = tmp_path / "contacts.xlsx"
+    _write_workbook(
+        excel_path,
+        [
+            (" Email ", "Tratamento", "NOME", "Pedido"),
+            ("joao@example.com", "Sr.", "João", 42),
+            (None, None, None, None),
+            ("maria@example.com", "Sra.", "Maria", None),
+        ],
+    )
+
+    contacts = list(iter_contacts(excel_path))
+
+    assert contacts == [
+        {"email": "joao@example.com", "tratamento": "Sr.", "nome": "João", "Pedido": "42"},
+        {"email": "maria@example.com", "tratamento": "Sra.", "nome": "Maria", "Pedido": ""},
+    ]
+
+
+def test_iter_contacts_streams_csv_rows(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    csv_path.write_text(
+        "EMAIL,tratamento,Nome,Cidade\njoao@example.com,Sr.,João,Recife\n",
+        encoding="utf-8",
+    )
+
+    contacts = list(iter_contacts(csv_path))
+
+    assert contacts == [
+        {"email": "joao@example.com", "tratamento": "Sr.", "nome": "João", "Cidade": "Recife"}
+    ]
+
+
+def test_iter_contacts_requires_mandatory_columns(tmp_path):
+    excel_path = tmp_path / "contacts.xlsx"
+    _write_workbook(excel_path, [("email", "nome"), ("joao@example.com", "João")])
+
+    with pytest.raises(ValueError):
+        list(iter_contacts(excel_path))
+
+
+def test_iter_contacts_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        iter_contacts(tmp_path / "missing.xlsx")
+
+
+def test_iter_contacts_projects_requested_columns(tmp_path):
+    excel_path = tmp_path / "contacts.xlsx"
+    _write_workbook(
+        excel_path,
+        [
+            ("email", "tratamento", "nome", "Cidade", "Observacao"),
+            ("joao@example.com", "Sr.", "João", "Recife", "ignorar"),
+        ],
+    )
+
+    contacts = list(iter_contacts(excel_path, columns={"cidade"}))
+
+    assert contacts == [
+        {"email": "joao@example.com", "tratamento": "Sr.", "nome": "João", "Cidade": "Recife"}
+    ]
+
+
+def test_iter_contacts_fills_missing_defaults(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    csv_path.write_text(
+        "email,tratamento,nome,data_envio\njoao@example.com,Sr.,João,2024-01-02\n",
+        encoding="utf-8",
+    )
+
+    contacts = list(
+        iter_contacts(csv_path, defaults={"data_envio": "", "cidade": "Recife"})
+    )
+
+    assert contacts == [
+        {
+            "email": "joao@example.com",
+            "tratamento": "Sr.",
+            "nome": "João",
+            "data_envio": "2024-01-02",
+            "cidade": "Recife",
+        }
+    ]
+
+
+def test_iter_contacts_pads_short_csv_rows(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    csv_path.write_text(
+        "email,tratamento,nome,cidade\n\njoao@example.com,Sr.,João\n",
+        encoding="utf-8",
+    )
+
+    contacts = list(iter_contacts(csv_path))
+
+    assert contacts == [
+        {"email": "joao@example.com", "tratamento": "Sr.", "nome": "João", "cidade": ""}
+    ]
+
+
+def test_iter_contacts_streams_parquet_rows(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    parquet_path = tmp_path / "contacts.parquet"
+    table = pa.table(
+        {
+            " Email ": ["joao@example.com", "maria@example.com"],
+            "Tratamento": ["Sr.", "Sra."],
+            "NOME": ["João", "Maria"],
+            "Pedido": [42, None],
+            "Observacao": ["ignorar", "ignorar"],
+        }
+    )
+    pq.write_table(table, parquet_path)
+
+    contacts = list(iter_contacts(parquet_path, columns={"pedido"}))
+
+    assert contacts == [
+        {"email": "joao@example.com", "tratamento": "Sr.", "nome": "João", "Pedido": "42"},
+        {"email": "maria@example.com", "tratamento": "Sra.", "nome": "Maria", "Pedido": ""},
+    ]
+
+
+def test_iter_contacts_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    parquet_path = tmp_path / "contacts.parquet"
+    parquet_path.touch()
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        list(iter_contacts(parquet_path))
+
+
+def test_list_sheet_names_reads_workbook_metadata(tmp_path):
+    excel_path = tmp_path / "contacts.xlsx"
+    workbook = Workbook()
+    workbook.active.title = "Leads"
+    workbook.create_sheet("Arquivo")
+    workbook.save(excel_path)
+
+    assert list_sheet_names(excel_path) == ["Leads", "Arquivo"]
+
+
+def test_load_contacts_reads_only_requested_rows(tmp_path):
+    excel_path = tmp_path / "contacts.xlsx"
+    _write_workbook(
+        excel_path,
+        [
+            ("Email", "Tratamento", "Nome", "Cidade"),
+            ("joao@example.com", "Sr.", "João", "Recife"),
+            ("maria@example.com", "Sra.", "Maria", "Natal"),
+        ],
+    )
+
+    loaded = load_contacts(excel_path, nrows=1)
+
+    assert list(loaded.columns) == ["email", "tratamento", "nome", "Cidade"]
+    assert loaded["email"].tolist() == ["joao@example.com"]
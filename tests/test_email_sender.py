@@ -1,9 +1,13 @@
+from functools import lru_cache
 from pathlib import Path
 import logging
 import sys
+import threading
+import time
 
 import pandas as pd
-from jinja2 import Template
+import pytest
+from jinja2 import Environment
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
@@ -11,6 +15,9 @@ from emaileria.datasource.excel import load_contacts
 import emaileria.cli as cli_module
 import emaileria.sender as sender_module
 
+_JINJA_ENV = Environment()
+_template = lru_cache(maxsize=None)(_JINJA_ENV.from_string)
+
 
 def test_load_contacts_preserves_optional_case(tmp_path, monkeypatch):
     contacts = pd.DataFrame(
@@ -61,7 +68,7 @@ def test_load_contacts_preserves_optional_case(tmp_path, monkeypatch):
 
     def render_with_capture(subject_template: str, body_template: str, context):
         contexts.append(dict(context))
-        return Template(subject_template).render(**context), Template(body_template).render(
+        return _template(subject_template).render(**context), _template(body_template).render(
             **context
         )
 
@@ -87,7 +94,7 @@ def test_load_contacts_preserves_optional_case(tmp_path, monkeypatch):
     assert context["DEPARTAMENTO"] == "Financeiro"
     assert context["InfoExtra"] == "VIP"
 
-    rendered_body = Template(body_template).render(**context)
+    rendered_body = _template(body_template).render(**context)
     assert "Financeiro" in rendered_body
     assert "VIP" in rendered_body
 
@@ -236,3 +243,94 @@ def test_cli_dry_run_logs_only_summary(tmp_path, monkeypatch, caplog):
     summary_message = next(message for message in debug_messages if "Resumo do dry-run" in message)
     assert "total=1" in summary_message
     assert "sucesso=1" in summary_message
+
+
+def test_iter_messages_yields_results_lazily() -> None:
+    consumed: list[str] = []
+
+    def contacts():
+        for name in ("Ana", "Bruno"):
+            consumed.append(name)
+            yield {"email": f"{name.lower()}@example.com", "tratamento": "", "nome": name}
+
+    results = sender_module.iter_messages(
+        sender="sender@example.com",
+        contacts=contacts(),
+        subject_template="Olá {{ nome }}",
+        body_template="{{ nome }}",
+        dry_run=True,
+    )
+
+    assert consumed == []
+    first = next(results)
+    assert first.destinatario == "ana@example.com"
+    assert consumed == ["Ana"]
+    assert [result.assunto for result in results] == ["Olá Bruno"]
+
+
+def test_iter_messages_requires_provider_eagerly() -> None:
+    with pytest.raises(ValueError):
+        sender_module.iter_messages(
+            sender="sender@example.com",
+            contacts=[],
+            subject_template="",
+            body_template="",
+        )
+
+
+def test_send_messages_interval_wait_stops_on_cancel(monkeypatch):
+    def fake_sleep(seconds):
+        raise AssertionError("sleep called")
+
+    monkeypatch.setattr(sender_module.time, "sleep", fake_sleep)
+    cancel_event = threading.Event()
+    contacts = [
+        {"email": "ana@example.com", "tratamento": "Sra.", "nome": "Ana"},
+        {"email": "bia@example.com", "tratamento": "Sra.", "nome": "Bia"},
+    ]
+
+    results = []
+    for result in sender_module.iter_messages(
+        sender="sender@example.com",
+        contacts=contacts,
+        subject_template="Olá {{ nome }}",
+        body_template="Olá {{ nome }}",
+        dry_run=True,
+        interval_seconds=60,
+        cancel_event=cancel_event,
+    ):
+        results.append(result)
+        cancel_event.set()
+
+    assert [result.destinatario for result in results] == ["ana@example.com"]
+
+
+def test_send_messages_interval_wait_is_cut_short_by_cancel():
+    cancel_event = threading.Event()
+    contacts = [
+        {"email": "ana@example.com", "tratamento": "Sra.", "nome": "Ana"},
+        {"email": "bia@example.com", "tratamento": "Sra.", "nome": "Bia"},
+    ]
+    # Fires while the sender is already blocked in the 60 s pause.
+    canceller = threading.Timer(0.2, cancel_event.set)
+
+    started = time.monotonic()
+    canceller.start()
+    try:
+        results = list(
+            sender_module.iter_messages(
+                sender="sender@example.com",
+                contacts=contacts,
+                subject_template="Olá {{ nome }}",
+                body_template="Olá {{ nome }}",
+                dry_run=True,
+                interval_seconds=60,
+                cancel_event=cancel_event,
+            )
+        )
+    finally:
+        canceller.cancel()
+    elapsed = time.monotonic() - started
+
+    assert [result.destinatario for result in results] == ["ana@example.com"]
+    assert elapsed < 5
@@ -0,0 +1,44 @@
+"""Tests for the dry-run example script."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+from pathlib import Path
+import sys
+import time
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+_SPEC = importlib.util.spec_from_file_location(
+    "send_messages_dry_run", ROOT_DIR / "examples" / "send_messages_dry_run.py"
+)
+dry_run_example = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(dry_run_example)
+
+
+def test_iter_reports_keeps_order_with_bounded_chunks_in_flight():
+    pulled: list[int] = []
+
+    def chunks():
+        for index in range(12):
+            pulled.append(index)
+            yield [{"index": index}]
+
+    def render_chunk(chunk):
+        index = chunk[0]["index"]
+        # Later chunks finish first, so ordering cannot come from completion.
+        time.sleep(0.002 * (3 - index % 4))
+        return f"{index}\n".encode()
+
+    reports: list[bytes] = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for report in dry_run_example._iter_reports(
+            executor, render_chunk, chunks(), max_in_flight=3
+        ):
+            # The finished chunk being handed back plus at most three pending.
+            assert len(pulled) - len(reports) <= 1 + 3
+            reports.append(report)
+
+    assert reports == [f"{index}\n".encode() for index in range(12)]
@@ -1,6 +1,14 @@
 from datetime import date, datetime
 
-from emaileria.templating import render
+import pytest
+from jinja2 import Environment, StrictUndefined, TemplateSyntaxError
+
+from emaileria.templating import (
+    TemplateRenderingError,
+    _compile,
+    render,
+    template_variables,
+)
 
 
 def test_render_injects_default_dates() -> None:
@@ -34,3 +42,82 @@ def test_render_allows_context_to_override_globals() -> None:
 
     assert subject == "custom"
     assert body == "12:34"
+
+
+def test_template_variables_includes_filtered_expressions() -> None:
+    names = template_variables("{{ nome }}", "{{ cidade | default('') }} {{ now|datefmt }}")
+
+    assert names == {"nome", "cidade", "now"}
+
+
+def test_render_reuses_compiled_templates() -> None:
+    _compile.cache_clear()
+
+    for name in ("Ana", "Bruno"):
+        render("Olá {{ nome | upper }}", "{{ nome | lower }}", {"nome": name})
+
+    info = _compile.cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
+
+
+def test_render_fast_path_matches_jinja_output() -> None:
+    context = {"nome": "Ana", "total": 3}
+    simple = "Olá {nome} {{ nome }}, {{total}} itens }}\n"
+    jinja = "Olá {nome} {{ nome | default('') }}, {{total}} itens }}\n"
+
+    assert render(simple, simple, context) == render(jinja, jinja, context)
+
+
+def test_render_fast_path_handles_missing_placeholders() -> None:
+    missing: list[str] = []
+
+    subject, _ = render(
+        "Olá {{ nome }}{{ sobrenome }}",
+        "",
+        {"nome": "Ana"},
+        allow_missing=True,
+        on_missing=missing.append,
+    )
+
+    assert subject == "Olá Ana"
+    assert missing == ["sobrenome"]
+    with pytest.raises(TemplateRenderingError) as excinfo:
+        render("Olá {{ sobrenome }}", "", {"nome": "Ana"})
+    assert excinfo.value.placeholder == "sobrenome"
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{{ true }} {{ false }} {{ none }}",
+        "{{ True }} {{ False }} {{ None }} {{ nome }}",
+        "a\r\nb {{ nome }}",
+        "{{ range }} {{ dict }} {{ nome }}",
+        "{{ lipsum }} {{ cycler }} {{ joiner }} {{ namespace }}",
+    ],
+)
+def test_render_leaves_jinja_specific_templates_to_jinja(template: str) -> None:
+    context = {"nome": "Z"}
+    expected = (
+        Environment(undefined=StrictUndefined, keep_trailing_newline=True)
+        .from_string(template)
+        .render(context)
+    )
+
+    assert render(template, template, context) == (expected, expected)
+    assert render(template, template, context, allow_missing=True) == (
+        expected,
+        expected,
+    )
+
+
+@pytest.mark.parametrize("template", ["{{{ nome }}", "a {{{nome}} b"])
+def test_render_matches_jinja_syntax_errors(template: str) -> None:
+    with pytest.raises(TemplateSyntaxError):
+        Environment().from_string(template)
+
+    with pytest.raises(TemplateSyntaxError):
+        render(template, "", {"nome": "Ana"})
+    with pytest.raises(TemplateSyntaxError):
+        render(template, "", {"nome": "Ana"}, allow_missing=True)